@@ -0,0 +1,224 @@
+"""Throughput and peak memory benchmarks for the builtin schemas.
+
+Run ``python -m schematic.benchmarks --help`` for the command line interface.
+``baseline.json`` next to this module holds the results of the current release
+(``--save``), which ``--baseline`` without a file compares against. Throughput
+depends on the machine, so it's stored relative to the ``reference`` benchmark,
+plain Python code that gets measured in the same run. For a strict comparison
+record a baseline with the previous release on the same machine.
+"""
+from datetime import datetime
+import gc
+import os
+import time
+import tracemalloc
+import typing
+from .. import sd
+
+class Benchmark(object):
+    """Converts ``value`` with ``schema``. Invalid benchmarks expect ``Invalid``."""
+
+    def __init__(self, name, schema, value, invalid=False):
+        self.name = name
+        self.schema = schema
+        self.value = value
+        self.invalid = invalid
+
+    def __call__(self):
+        try:
+            self.schema.convert(self.value)
+        except sd.Invalid:
+            if not self.invalid:
+                raise
+        else:
+            if self.invalid:
+                raise AssertionError(f'{self.name}: Invalid not raised')
+
+    def measure(self, min_time=0.2, repeat=3):
+        """Returns the calls per second (the best of ``repeat`` runs of at least
+        ``min_time`` seconds each) and the peak memory of one call in bytes.
+        """
+        self()
+        number = 1
+        while True:
+            elapsed = self._time(number)
+            if elapsed >= min_time:
+                break
+            number *= 2 if elapsed * 2 >= min_time else 10
+        best = min([elapsed] + [self._time(number) for _ in range(repeat - 1)])
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            self()
+            peak = tracemalloc.get_traced_memory()[1] - start
+        finally:
+            tracemalloc.stop()
+        return {'ops_per_sec': number / best, 'peak_bytes': peak}
+
+    def _time(self, number):
+        timer = time.perf_counter
+        start = timer()
+        for _ in range(number):
+            self()
+        return timer() - start
+
+# The benchmark the throughput of the others is relative to.
+REFERENCE = 'reference'
+
+class _Reference(Benchmark):
+    """Converts strings to ints without a schema, which only depends on the machine
+    and the Python version.
+    """
+
+    def __init__(self):
+        super().__init__(REFERENCE, None, [str(index) for index in range(1000)])
+
+    def __call__(self):
+        return {index: int(value) for index, value in enumerate(self.value)}
+
+class _Even(object):
+    """A validator that isn't one of the builtin ones."""
+    __slots__ = ()
+
+    def check(self, value, path):
+        if value % 2:
+            raise sd.Invalid(self, path, 'This value must be even.', bad_value=value)
+
+Person = typing.NamedTuple('Person', [
+    ('name', str),
+    ('age', int),
+    ('born', datetime),
+])
+People = typing.NamedTuple('People', [
+    ('count', int),
+    ('people', typing.List[Person]),
+])
+
+class _UnplannedDict(sd.Dict):
+    """A ``Dict`` without the cached plans, the reference for ``dict_10_fields``."""
+    __slots__ = ()
+
+    def _plan(self, value):
+        plan = sd._Plan(self.schema, value)
+        return plan, plan.entries(self.schema)
+
+def _record(index):
+    return {'name': f'Person {index}', 'age': str(index % 100),
+            'email': f'person{index}@example.com', 'tags': ['a', 'b']}
+
+def _benchmarks():
+    yield _Reference()
+
+    record_schema = sd.Dict({'name': sd.String(), 'age': sd.Int(),
+                             'email': sd.Email(), 'tags': sd.List(sd.String())})
+    yield Benchmark('dict_fields', record_schema, _record(1))
+    yield Benchmark('dict_fields_invalid', record_schema,
+                    {'name': '', 'age': 'x', 'email': 'no', 'tags': 1, 'other': 1},
+                    invalid=True)
+    fields = {f'field{index}': sd.Int() for index in range(10)}
+    values = {key: index for index, key in enumerate(fields)}
+    yield Benchmark('dict_10_fields', sd.Dict(fields), values)
+    yield Benchmark('dict_10_fields_unplanned', _UnplannedDict(fields), values)
+    yield Benchmark('dict_key_value_100', sd.Dict((sd.String(), sd.Int())),
+                    {f'key{index}': index for index in range(100)})
+
+    for size in (10, 1000, 100000):
+        values = list(range(size))
+        yield Benchmark(f'list_{size}', sd.List(sd.Int()), values)
+        yield Benchmark(f'set_{size}', sd.Set(sd.Int()), values)
+        yield Benchmark(f'tuple_{size}', sd.Tuple(sd.Int()), tuple(values))
+    yield Benchmark('list_1000_invalid', sd.List(sd.Int()), ['x'] * 1000, invalid=True)
+    yield Benchmark('list_records_1000', sd.List(record_schema),
+                    [_record(index) for index in range(1000)])
+    bounded = sd.Int(validators=[sd.MinValue(0), sd.MaxValue(10000), _Even()])
+    yield Benchmark('validators_list_1000', sd.List(bounded), list(range(0, 2000, 2)))
+    yield Benchmark('validators_list_1000_invalid', sd.List(bounded), list(range(1000)),
+                    invalid=True)
+    names = [f'name{index}' for index in range(10)]
+    yield Benchmark('validators_strings_1000',
+                    sd.List(sd.String(validators=[sd.MinLength(1), sd.MaxLength(20),
+                                                  sd.In(names)])),
+                    [names[index % 10] for index in range(1000)])
+    yield Benchmark('tuple_positional', sd.Tuple((sd.Int(), sd.String(), sd.Float())),
+                    (1, 'a', 1.5))
+
+    people = {'count': 100,
+              'people': [{'name': f'Person {index}', 'age': index,
+                          'born': '2006-10-25 14:30:59'} for index in range(100)]}
+    yield Benchmark('named_tuple_100', sd.from_typing(People), people)
+
+    choices = [sd.Dict({'kind': 'a', 'value': sd.Int()}), sd.List(sd.Int()), sd.Float(),
+               sd.DateTime(), sd.Int(), sd.Dict({'kind': 'b', 'value': sd.String()})]
+    yield Benchmark('one_of_first', sd.OneOf(choices), {'kind': 'a', 'value': 1})
+    yield Benchmark('one_of_last', sd.OneOf(choices), {'kind': 'b', 'value': 'x'})
+    yield Benchmark('one_of_invalid', sd.OneOf(choices), {'kind': 'c'}, invalid=True)
+
+    sample = datetime(2006, 10, 25, 14, 30, 59, 123456)
+    for position, format in enumerate(sd.DATETIME_INPUT_FORMATS):
+        yield Benchmark(f'datetime_format_{position}', sd.DateTime(),
+                        sample.strftime(format))
+    yield Benchmark('datetime_invalid', sd.DateTime(), '2006-13-45', invalid=True)
+
+    yield Benchmark('email', sd.Email(), 'Some.Person@Example.com')
+    yield Benchmark('email_idna', sd.Email(), 'person@bücher.de')
+    yield Benchmark('email_invalid', sd.Email(), 'person@@example', invalid=True)
+
+# The results that come with the package, see the module docstring.
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def benchmarks():
+    """Builds the benchmarks with their inputs and returns them by name."""
+    return {benchmark.name: benchmark for benchmark in _benchmarks()}
+
+def run(names=None, min_time=0.2, repeat=3, report=None):
+    """Runs the given benchmarks (default: all) and returns their results by name.
+
+    The reference benchmark always runs first. Each result has the calls per second
+    (``ops_per_sec``), the throughput ``relative`` to the reference and the
+    ``peak_bytes``.
+    """
+    available = benchmarks()
+    results = {}
+    reference = None
+    for name in [REFERENCE] + [name for name in names or available if name != REFERENCE]:
+        result = available[name].measure(min_time, repeat)
+        if reference is None:
+            reference = result['ops_per_sec']
+        result['relative'] = result['ops_per_sec'] / reference
+        results[name] = result
+        if report is not None:
+            report(name, result)
+    return results
+
+def baseline(results):
+    """Returns the part of the results that a baseline stores: the relative
+    throughput and the peak memory, which don't depend on the machine as much.
+    """
+    return {name: {'relative': result['relative'], 'peak_bytes': result['peak_bytes']}
+            for name, result in results.items()}
+
+# Small peaks vary by a few hundred bytes between runs.
+_MEMORY_SLACK = 1024
+
+def compare(results, baseline, tolerance=0.2, memory_tolerance=0.2):
+    """Returns a message for every result that regressed compared to ``baseline``.
+
+    A benchmark regresses if its throughput relative to the reference dropped or
+    its peak memory grew by more than the given fractions. Benchmarks that are
+    missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        if result['relative'] < old['relative'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['relative']:.4f} of the reference, "
+                               f"baseline {old['relative']:.4f}")
+        limit = old['peak_bytes'] * (1 + memory_tolerance) + _MEMORY_SLACK
+        if result['peak_bytes'] > limit:
+            regressions.append(f"{name}: {result['peak_bytes']} bytes peak, "
+                               f"baseline {old['peak_bytes']}")
+    return regressions
@@ -0,0 +1,55 @@
+import argparse
+import json
+import sys
+from . import BASELINE_FILE, baseline, benchmarks, compare, run
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m schematic.benchmarks',
+                                     description='Runs the schematic benchmarks.')
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help='benchmarks to run (default: all)')
+    parser.add_argument('--baseline', metavar='FILE', nargs='?', const=BASELINE_FILE,
+                        help='fail if the results regressed compared to this JSON file '
+                             '(default: the baseline that comes with the package)')
+    parser.add_argument('--save', metavar='FILE',
+                        help='write the results to this JSON file, as a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed drop of the relative throughput as a fraction '
+                             '(default: 0.2)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.2,
+                        help='allowed peak memory growth as a fraction (default: 0.2)')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='minimum seconds per timing run (default: 0.2)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timing runs per benchmark, the best one counts (default: 3)')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args(args)
+
+    names = list(benchmarks())
+    if args.list:
+        print('\n'.join(names))
+        return 0
+    unknown = [name for name in args.names if name not in names]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    def report(name, result):
+        print(f"{name:<28} {result['ops_per_sec']:>14,.1f} calls/s "
+              f"{result['relative']:>10.4f} x reference "
+              f"{result['peak_bytes']:>12,} bytes peak")
+
+    results = run(args.names, args.min_time, args.repeat, report)
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(baseline(results), file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as file:
+            old = json.load(file)
+        regressions = compare(results, old, args.tolerance, args.memory_tolerance)
+        if regressions:
+            print('\nRegressions:', *regressions, sep='\n', file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""Converts JSON documents with a schema while they get parsed.
+
+Use ``Schema.convert_json()``. The parser walks the document and the schema
+together, so no intermediate tree of the whole document gets built:
+
+* Objects for a ``Dict`` (also ``NamedTuple`` and ``DataClass``) and arrays for
+  a ``List``, ``Tuple`` or ``Set`` with a schema for all entries (and without
+  ``as_array``) get their entries converted one by one as they're parsed.
+* Keys that ``ignore_rest`` discards get skipped without building their values.
+  Skipped values are still checked for being valid JSON.
+* Everything else (strings, numbers, ``OneOf``, literal values, ordered tuples
+  and subclasses that override ``convert()`` or ``_convert()``) gets parsed into
+  a plain value and passed to the schema's ``convert()``.
+* With ``fail_fast=True`` parsing stops at the first error, unless a schema
+  with ``use_default_for_invalid`` has to continue after the invalid value.
+
+The errors are the same as with ``convert()``, except that the ``Invalid`` of a
+streamed object or array has no ``bad_value`` and lists its errors in document
+order.
+"""
+import codecs
+import json
+from json.decoder import scanstring
+from json.scanner import NUMBER_RE
+import re
+from .sd import (DataClass, Dict, Invalid, IterableSchema, NamedTuple, Path, Schema,
+                 _UNDEFINED, _ErrorOptions, _count_errors, _discard_errors)
+
+# The number of characters or bytes that get read from a file at once.
+_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# The characters a number can consist of. A number only ends where they do.
+_NUMBER_CHARS = re.compile(r'[-+.\deE]*')
+# Like json.loads(), NaN and the infinities are accepted, too.
+_CONSTANTS = (('true', True), ('false', False), ('null', None), ('NaN', float('nan')),
+              ('Infinity', float('inf')), ('-Infinity', float('-inf')))
+_MAX_CONSTANT = max(len(name) for name, value in _CONSTANTS)
+
+def convert_json(schema, source, path=(), **kwargs):
+    if 'max_errors' in kwargs or 'bad_values' in kwargs:
+        options = _ErrorOptions(kwargs)
+        try:
+            return convert_json(schema, source, path, **kwargs)
+        except Invalid as error:
+            source = None
+            raise options.apply(error)
+    reader = _Reader(source)
+    result = _Parser(reader, kwargs).convert(schema, path)
+    if reader.peek():
+        raise reader.error('Extra data')
+    return result
+
+class _Reader(object):
+    """A buffer over the source that only holds the unparsed rest of the chunks."""
+
+    def __init__(self, source):
+        self.pos = 0
+        if isinstance(source, (bytes, bytearray)):
+            source = bytes(source).decode('utf-8')
+        if isinstance(source, str):
+            self.buffer = source
+            self._file = None
+        else:
+            self.buffer = ''
+            self._file = source
+            self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def fill(self):
+        """Appends the next chunk to the buffer, returns False at the end."""
+        while self._file is not None:
+            chunk = self._file.read(_CHUNK_SIZE)
+            if not chunk:
+                # Raises for a truncated UTF-8 sequence.
+                self._decoder.decode(b'', final=True)
+                self._file = None
+                return False
+            if isinstance(chunk, bytes):
+                # Can be empty if the chunk ends within a UTF-8 sequence.
+                chunk = self._decoder.decode(chunk)
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """Skips whitespace and returns the next character, '' at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def match(self, pattern):
+        # A match that reaches the end of the buffer might continue in the next chunk.
+        while True:
+            match = pattern.match(self.buffer, self.pos)
+            if match is not None and match.end() < len(self.buffer) or not self.fill():
+                return match
+
+    def string(self):
+        while True:
+            try:
+                value, self.pos = scanstring(self.buffer, self.pos + 1)
+                return value
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+
+    def scalar(self):
+        while len(self.buffer) - self.pos < _MAX_CONSTANT and self.fill():
+            pass
+        for name, value in _CONSTANTS:
+            if self.buffer.startswith(name, self.pos):
+                self.pos += len(name)
+                return value
+        end = self.match(_NUMBER_CHARS).end()
+        match = NUMBER_RE.match(self.buffer, self.pos)
+        if match is None or match.end() != end:
+            raise self.error('Expecting value')
+        self.pos = match.end()
+        integer, fraction, exponent = match.groups()
+        if fraction or exponent:
+            return float(integer + (fraction or '') + (exponent or ''))
+        return int(integer)
+
+class _Parser(object):
+    def __init__(self, reader, kwargs):
+        self.reader = reader
+        self.kwargs = kwargs
+        self.fail_fast = kwargs.get('fail_fast')
+        # The number of enclosing schemas that fall back to their default when
+        # they're invalid. While there are any, fail_fast has to skip the rest of
+        # an invalid value instead of stopping right away.
+        self.resumable = 0
+
+    def convert(self, schema, path):
+        char = self.reader.peek()
+        if type(schema).convert is Schema.convert:
+            build = None
+            if char == '{' and isinstance(schema, Dict):
+                convert = type(schema)._convert
+                if convert is Dict._convert and schema.schema is not None:
+                    build = self.dict
+                elif convert is NamedTuple._convert:
+                    build = self.named_tuple
+                elif convert is DataClass._convert:
+                    build = self.data_class
+            elif (char == '[' and type(schema)._convert is IterableSchema._convert and
+                    isinstance(schema.schema, Schema) and not schema.as_array):
+                build = self.iterable
+            if build is not None:
+                return self.validated(schema, build, path)
+        return schema.convert(self.value(), path, **self.kwargs)
+
+    def validated(self, schema, build, path):
+        # Mirrors Schema.convert() for a value that's built while being parsed.
+        resumable = bool(schema.use_default_for_invalid)
+        self.resumable += resumable
+        try:
+            self.reader.pos += 1
+            value = build(schema, path)
+        except Invalid as error:
+            if schema.use_default_for_invalid:
+                _discard_errors(error, self.kwargs)
+                return schema.get_default(path)
+            _count_errors(error, self.kwargs)
+            raise
+        finally:
+            self.resumable -= resumable
+        return schema._validated(value, path, self.kwargs)
+
+    def dict(self, schema, path):
+        keys = self.keys()
+        fail_fast = self.fail_fast
+        errors = []
+        result = {}
+        if isinstance(schema.schema, (tuple, list)):
+            key_schema, value_schema = schema.schema
+            for key in keys:
+                subpath = Path(path, key)
+                try:
+                    result_key = key_schema.convert(key, subpath, **self.kwargs)
+                except Invalid as error:
+                    errors.append(error)
+                    if fail_fast:
+                        self.abort(keys, pending=True)
+                        break
+                try:
+                    result_value = self.convert(value_schema, subpath)
+                except Invalid as error:
+                    errors.append(error)
+                    if fail_fast:
+                        self.abort(keys)
+                        break
+                if not errors:
+                    result[result_key] = result_value
+
+            if errors:
+                raise Invalid(schema, path, children=errors)
+            return result
+
+        # Each entry goes through Dict._walk_fields() on its own, so the entries get
+        # converted (and their errors reported) in document order.
+        fields = schema.schema
+        walk = schema._walk_fields
+        seen = set()
+        non_converted = set()
+        for key in keys:
+            field = fields.get(key, _UNDEFINED)
+            if field is _UNDEFINED:
+                self.skip()
+                if not schema.ignore_rest:
+                    # A key can occur more than once, but gets reported once.
+                    non_converted.add(key)
+                continue
+            seen.add(key)
+            value = None if isinstance(field, Schema) else self.value()
+            result.update(walk({key: value}, path, self.convert_field, errors,
+                               items=((key, field),)))
+            if fail_fast and errors:
+                self.abort(keys)
+                break
+
+        missing = [(key, field) for key, field in fields.items() if key not in seen]
+        result.update(walk({}, path, None, errors, fail_fast, missing))
+        schema._fields_error(_UNDEFINED, path, errors, non_converted, fail_fast)
+        return result
+
+    def convert_field(self, field, key, value, path):
+        # Converts a Dict entry as it's parsed, for Dict._walk_fields().
+        return self.convert(field, Path(path, key))
+
+    def named_tuple(self, schema, path):
+        result = self.dict(schema, path)
+        if self.kwargs.get('named_tuple_to_dict'):
+            return result
+        return schema.named_tuple(**result)
+
+    def data_class(self, schema, path):
+        return schema.data_class(**self.dict(schema, path))
+
+    def iterable(self, schema, path):
+        entries = self.entries()
+        errors = []
+        result = []
+        for index in entries:
+            try:
+                result.append(self.convert(schema.schema, Path(path, index)))
+            except Invalid as error:
+                errors.append(error)
+                if self.fail_fast:
+                    self.abort(entries)
+                    break
+        if errors:
+            raise Invalid(schema, path, children=errors)
+        return schema._type(result)
+
+    def abort(self, entries, pending=False):
+        # Stops at the first error with fail_fast. The rest of the object or array
+        # only gets skipped if an enclosing schema continues after it.
+        if self.resumable:
+            if pending:
+                self.skip()
+            for _ in entries:
+                self.skip()
+
+    def keys(self):
+        """Yields the keys of an object after its '{'.
+
+        The reader is left at the key's value, which the caller has to consume.
+        """
+        reader = self.reader
+        if reader.peek() == '}':
+            reader.pos += 1
+            return
+        while True:
+            if reader.peek() != '"':
+                raise reader.error('Expecting property name enclosed in double quotes')
+            key = reader.string()
+            if reader.peek() != ':':
+                raise reader.error("Expecting ':' delimiter")
+            reader.pos += 1
+            yield key
+            char = reader.peek()
+            reader.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise reader.error("Expecting ',' delimiter")
+
+    def entries(self):
+        """Yields the indices of an array after its '['. See keys()."""
+        reader = self.reader
+        if reader.peek() == ']':
+            reader.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            char = reader.peek()
+            reader.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise reader.error("Expecting ',' delimiter")
+
+    def value(self):
+        """Parses the next value like json.loads()."""
+        reader = self.reader
+        char = reader.peek()
+        if char == '"':
+            return reader.string()
+        if char == '{':
+            reader.pos += 1
+            result = {}
+            for key in self.keys():
+                result[key] = self.value()
+            return result
+        if char == '[':
+            reader.pos += 1
+            return [self.value() for _ in self.entries()]
+        return reader.scalar()
+
+    def skip(self):
+        """Consumes the next value like value(), but without building it."""
+        reader = self.reader
+        char = reader.peek()
+        if char == '"':
+            reader.string()
+        elif char == '{':
+            reader.pos += 1
+            for _ in self.keys():
+                self.skip()
+        elif char == '[':
+            reader.pos += 1
+            for _ in self.entries():
+                self.skip()
+        else:
+            reader.scalar()
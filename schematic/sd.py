@@ -1,5 +1,27 @@
+import array
+import asyncio
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import copy
 from datetime import datetime, date, time
+import functools
+import inspect
+import itertools
+import json
+import math
+import multiprocessing
+import operator
+import os
+import pickle
 import re
+import reprlib
+import string
+import struct
+import threading
+from time import perf_counter
+import types
 import typing
 
 try:
@@ -7,20 +29,146 @@ try:
 except ImportError:
     UTC = None
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import dataclasses
+except ImportError:
+    dataclasses = None
+
 _UNDEFINED = object()
+# Returned by the exception-free checking path instead of raising Invalid.
+_INVALID = object()
+# A patch value that removes the entry, see Schema.revalidate().
+REMOVE = object()
+
+class Path(object):
+    """A path that links to its parent path instead of copying it.
+
+    Nested schemas pass ``Path(path, key)`` to their children instead of building
+    ``path + (key,)`` for every entry. The path is only turned into a tuple when
+    it's actually needed, e.g. when an ``Invalid`` gets raised.
+    """
+    __slots__ = ('parent', 'key')
+
+    def __init__(self, parent, key):
+        self.parent = parent
+        self.key = key
+
+    def as_tuple(self):
+        keys = []
+        path = self
+        while isinstance(path, Path):
+            keys.append(path.key)
+            path = path.parent
+        keys.reverse()
+        return tuple(path) + tuple(keys)
+
+    def __iter__(self):
+        return iter(self.as_tuple())
+
+    def __len__(self):
+        return len(self.as_tuple())
+
+    def __getitem__(self, index):
+        return self.as_tuple()[index]
+
+    def __add__(self, other):
+        return self.as_tuple() + tuple(other)
+
+    def __radd__(self, other):
+        return tuple(other) + self.as_tuple()
+
+    def __eq__(self, other):
+        if isinstance(other, (Path, tuple)):
+            return self.as_tuple() == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        return repr(self.as_tuple())
+
+def as_path_tuple(path):
+    if isinstance(path, Path):
+        return path.as_tuple()
+    return tuple(path)
+
+class _MessageFormatter(string.Formatter):
+    def convert_field(self, value, conversion):
+        # '!l' joins the repr()s of a sequence's items, '!j' joins their str()s.
+        if conversion == 'l':
+            return ', '.join(map(repr, value))
+        if conversion == 'j':
+            return ', '.join(map(str, value))
+        return super().convert_field(value, conversion)
+
+_message_formatter = _MessageFormatter()
 
 class Invalid(Exception):
-    def __init__(self, raisor, path=(), message='', children=(), bad_value=_UNDEFINED):
+    """A conversion error or a collection of errors keyed by their path.
+
+    If ``params`` is given, ``message`` is a ``str.format()`` template that only gets
+    rendered when the message is actually used. This keeps errors that get caught
+    and discarded (e.g. by ``OneOf``) cheap.
+
+    ``convert(value, max_errors=N)`` stops converting once ``N`` errors were
+    collected and reports at most that many. ``bad_values`` controls what the
+    errors keep of the invalid values: ``'keep'`` (the default) keeps them in
+    ``bad_value``, ``'repr'`` only keeps a truncated ``repr()`` and ``'drop'``
+    keeps nothing. Unless they're kept, the tracebacks get dropped, too, because
+    their frames reference the input.
+    """
+
+    def __init__(self, raisor, path=(), message='', children=(), bad_value=_UNDEFINED,
+                 params=None):
         self.raisor = raisor
-        self.message = message
+        self.template = message
+        self.params = params
+        self._message = None if params else message
         if not isinstance(children, (list, tuple)):
             children = [children]
         self.children = {}
         if message:
-            self.children[path] = [self]
+            self.children[as_path_tuple(path)] = [self]
         self.add(children)
         self.bad_value = bad_value
 
+    @property
+    def message(self):
+        if self._message is None:
+            self._message = _message_formatter.format(self.template, **self.params)
+        return self._message
+
+    @message.setter
+    def message(self, message):
+        self.template = self._message = message
+        self.params = None
+
+    def as_dicts(self):
+        """Returns the errors as a list of JSON-friendly dicts.
+
+        Each dict contains the ``path`` as a list, the ``code`` (the error's class
+        name), the rendered ``message`` and the message ``params``.
+        """
+        result = []
+        for path, children in self.children.items():
+            for child in children:
+                if not child.template:
+                    continue
+                params = {}
+                for name, value in (child.params or {}).items():
+                    if isinstance(value, (set, frozenset, tuple)):
+                        value = list(value)
+                    params[name] = value
+                result.append({'path': list(path), 'code': type(child).__name__,
+                               'message': child.message, 'params': params})
+        return result
+
     def __repr__(self):
         return str(self)
 
@@ -30,7 +178,7 @@ class Invalid(Exception):
             prefix = path + ': ' if path else ''
             index = 0
             for child in children:
-                if not child.message:
+                if not child.template:
                     continue
                 if index == 0:
                     result.append(prefix + child.message)
@@ -66,6 +214,8 @@ class MinLengthError(Invalid):
     pass
 
 class MinLength(object):
+    __slots__ = ('min_length',)
+
     def __init__(self, min_length):
         self.min_length = min_length
 
@@ -73,9 +223,10 @@ class MinLength(object):
         min_length = self.get_value()
         if len(value) < min_length:
             raise MinLengthError(self, path,
-                                 f'Ensure this value has at most {min_length} entries '
-                                 f'(it has {len(value)}).',
-                                 bad_value=value)
+                                 'Ensure this value has at most {min_length} entries '
+                                 '(it has {length}).',
+                                 bad_value=value,
+                                 params={'min_length': min_length, 'length': len(value)})
 
     def get_value(self):
         min_length = self.min_length
@@ -83,10 +234,21 @@ class MinLength(object):
             min_length = min_length()
         return min_length
 
+    def is_valid(self, value):
+        return not len(value) < self.get_value()
+
+    def _compile_check(self):
+        min_length = self.min_length
+        if callable(min_length):
+            return None
+        return lambda value: not len(value) < min_length
+
 class MaxLengthError(Invalid):
     pass
 
 class MaxLength(object):
+    __slots__ = ('max_length',)
+
     def __init__(self, max_length):
         self.max_length = max_length
 
@@ -94,9 +256,10 @@ class MaxLength(object):
         max_length = self.get_value()
         if len(value) > max_length:
             raise MaxLengthError(self, path,
-                                 f'Ensure this value has at most {max_length} entries '
-                                 f'(it has {len(value)}).',
-                                 bad_value=value)
+                                 'Ensure this value has at most {max_length} entries '
+                                 '(it has {length}).',
+                                 bad_value=value,
+                                 params={'max_length': max_length, 'length': len(value)})
 
     def get_value(self):
         max_length = self.max_length
@@ -104,10 +267,21 @@ class MaxLength(object):
             max_length = max_length()
         return max_length
 
+    def is_valid(self, value):
+        return not len(value) > self.get_value()
+
+    def _compile_check(self):
+        max_length = self.max_length
+        if callable(max_length):
+            return None
+        return lambda value: not len(value) > max_length
+
 class MinValueError(Invalid):
     pass
 
 class MinValue(object):
+    __slots__ = ('min_value',)
+
     def __init__(self, min_value):
         self.min_value = min_value
 
@@ -115,8 +289,8 @@ class MinValue(object):
         min_value = self.get_value()
         if value < min_value:
             raise MinValueError(self, path,
-                                f'This value must be larger than {min_value}.',
-                                bad_value=value)
+                                'This value must be larger than {min_value}.',
+                                bad_value=value, params={'min_value': min_value})
 
     def get_value(self):
         min_value = self.min_value
@@ -124,10 +298,21 @@ class MinValue(object):
             min_value = min_value()
         return min_value
 
+    def is_valid(self, value):
+        return not value < self.get_value()
+
+    def _compile_check(self):
+        min_value = self.min_value
+        if callable(min_value):
+            return None
+        return lambda value: not value < min_value
+
 class MaxValueError(Invalid):
     pass
 
 class MaxValue(object):
+    __slots__ = ('max_value',)
+
     def __init__(self, max_value):
         self.max_value = max_value
 
@@ -135,8 +320,8 @@ class MaxValue(object):
         max_value = self.get_value()
         if value > max_value:
             raise MaxValueError(self, path,
-                                f'This value must be smaller than {max_value}.',
-                                bad_value=value)
+                                'This value must be smaller than {max_value}.',
+                                bad_value=value, params={'max_value': max_value})
 
     def get_value(self):
         max_value = self.max_value
@@ -144,10 +329,21 @@ class MaxValue(object):
             max_value = max_value()
         return max_value
 
+    def is_valid(self, value):
+        return not value > self.get_value()
+
+    def _compile_check(self):
+        max_value = self.max_value
+        if callable(max_value):
+            return None
+        return lambda value: not value > max_value
+
 class EqualsError(Invalid):
     pass
 
 class Equals(object):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
@@ -155,8 +351,8 @@ class Equals(object):
         _value = self.get_value()
         if value != _value:
             raise EqualsError(self, path,
-                              f'This value must be equal to {_value!r}.',
-                              bad_value=value)
+                              'This value must be equal to {value!r}.',
+                              bad_value=value, params={'value': _value})
 
     def get_value(self):
         value = self.value
@@ -164,22 +360,49 @@ class Equals(object):
             return value()
         return value
 
+    def is_valid(self, value):
+        return not value != self.get_value()
+
+    def _compile_check(self):
+        _value = self.value
+        if callable(_value):
+            return None
+        return lambda value: not value != _value
+
 class InError(Invalid):
     pass
 
 class In(object):
+    __slots__ = ('choice',)
+
     def __init__(self, choice):
         self.choice = list(choice)
 
     def check(self, value, path):
         if value not in self.choice:
-            allowed = ', '.join(map(repr, self.choice))
-            raise InError(self, path, f'This value must be one of: {allowed}',
-                          bad_value=value)
+            raise InError(self, path, 'This value must be one of: {choices!l}',
+                          bad_value=value, params={'choices': self.choice})
 
     def get_value(self):
         return self.choice
 
+    def is_valid(self, value):
+        return value in self.choice
+
+    def _compile_check(self):
+        choice = self.choice
+        try:
+            choice_set = frozenset(choice)
+        except TypeError:
+            return None
+
+        def check(value):
+            try:
+                return value in choice_set
+            except TypeError:
+                return value in choice
+        return check
+
 email_re = re.compile(
     # dot-atom
     r"(^[-!#$%&'*+/=?^_`{}|~0-9A-Z]+(\.[-!#$%&'*+/=?^_`{}|~0-9A-Z]+)*"
@@ -194,24 +417,419 @@ email_re = re.compile(
 class EmailValidatorError(Invalid):
     pass
 
+def _encode_idna(domain):
+    return domain.encode('idna').decode('ascii')
+
 class EmailValidator(object):
+    """Validates e-mail addresses.
+
+    ``cache_size`` enables an LRU cache of that many validation results, keyed by
+    the address (``Email`` lowercases addresses before validating them). Domains
+    that need IDNA encoding are cached separately, ``domain_cache_size`` defaults
+    to ``cache_size``. To share one cache between schemas, use the same instance,
+    e.g. in the ``default_validators`` of an ``Email`` subclass.
+    """
+    __slots__ = ('cache_size', 'domain_cache_size', '_verdicts', '_encode_domain')
+
+    def __init__(self, cache_size=None, domain_cache_size=None):
+        self.cache_size = cache_size
+        self.domain_cache_size = domain_cache_size or cache_size
+        self._setup_caches()
+
+    def _setup_caches(self):
+        self._verdicts = None
+        self._encode_domain = _encode_idna
+        if self.cache_size:
+            self._verdicts = functools.lru_cache(self.cache_size)(self._is_valid)
+        if self.domain_cache_size:
+            self._encode_domain = functools.lru_cache(self.domain_cache_size)(_encode_idna)
+
+    def __getstate__(self):
+        # The caches can't be pickled. Unpickled copies start with empty ones.
+        return {'cache_size': self.cache_size, 'domain_cache_size': self.domain_cache_size}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._setup_caches()
+
     def check(self, value, path):
-        orig_value = value
-        if not email_re.match(value):
-            # Trivial case failed. Try for possible IDN domain-part
-            if value and '@' in value:
-                parts = value.split('@')
-                try:
-                    parts[-1] = parts[-1].encode('idna')
-                except UnicodeError:
-                    raise
-                value = '@'.join(parts)
-            if email_re.match(value):
-                return
+        if not self.is_valid(value):
             raise EmailValidatorError(self, path, 'Enter a valid e-mail address.',
-                                      bad_value=orig_value)
+                                      bad_value=value)
+
+    def is_valid(self, value):
+        if self._verdicts is not None:
+            return self._verdicts(value)
+        return self._is_valid(value)
+
+    def _is_valid(self, value):
+        if email_re.match(value):
+            return True
+        # Trivial case failed. Try for possible IDN domain-part
+        if value and '@' in value:
+            parts = value.split('@')
+            try:
+                parts[-1] = self._encode_domain(parts[-1])
+            except UnicodeError:
+                # E.g. empty or too long labels.
+                return False
+            value = '@'.join(parts)
+        return bool(email_re.match(value))
+
+    def cache_info(self):
+        """Returns the hit/miss statistics of the address and domain caches."""
+        return {
+            'addresses': self._verdicts.cache_info() if self._verdicts else None,
+            'domains': (self._encode_domain.cache_info()
+                        if self._encode_domain is not _encode_idna else None),
+        }
+
+    def cache_clear(self):
+        if self._verdicts is not None:
+            self._verdicts.cache_clear()
+        if self._encode_domain is not _encode_idna:
+            self._encode_domain.cache_clear()
+
+def _is_async_validator(validator):
+    return inspect.iscoroutinefunction(getattr(validator, 'check', None))
+
+def _async_check_error(validator, result):
+    if hasattr(result, 'close'):
+        result.close()
+    return TypeError(f'{validator!r} is async, use aconvert() instead.')
+
+class _AsyncContext(object):
+    """The options and state of one aconvert() call."""
+
+    def __init__(self, yield_every, kwargs):
+        self.yield_every = yield_every
+        self.kwargs = kwargs
+        self.count = 0
+        self._async = {}
+
+    def derive(self, **kwargs):
+        context = _AsyncContext(self.yield_every, dict(self.kwargs, **kwargs))
+        context._async = self._async
+        return context
+
+    def is_async(self, schema):
+        # Whether the schema or one of its children has async validators.
+        key = id(schema)
+        result = self._async.get(key)
+        if result is None:
+            # Recursive references see the own validators while children get visited.
+            result = self._async[key] = any(map(_is_async_validator, schema.validators))
+            if not result:
+                result = self._async[key] = any(map(self.is_async, schema._subschemas()))
+        return result
+
+    def inline(self, schema):
+        # Collections always take the async path, so they can yield to the event loop.
+        return not isinstance(schema, NestedSchema) and not self.is_async(schema)
+
+    def tick(self):
+        # Returns True every yield_every entries.
+        self.count += 1
+        if self.count < self.yield_every:
+            return False
+        self.count = 0
+        return True
+
+async def _agather(jobs):
+    # Runs the coroutines concurrently and returns their results or Invalid errors.
+    outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Invalid):
+            raise outcome
+    return outcomes
+
+async def _settle(pending, outcomes):
+    # Awaits the pending (position, coroutine) pairs. Without any, this still yields
+    # to the event loop.
+    if not pending:
+        await asyncio.sleep(0)
+        return
+    results = await _agather(job for _, job in pending)
+    for (position, _), outcome in zip(pending, results):
+        outcomes[position] = outcome
+
+async def _aconvert_entries(entries, context):
+    # Converts (schema, value, path) entries and returns their results or Invalid
+    # errors in order. Entries that need async checks are converted concurrently,
+    # in batches of yield_every.
+    fail_fast = context.kwargs.get('fail_fast')
+    outcomes = []
+    pending = []
+    for schema, value, path in entries:
+        if context.inline(schema):
+            try:
+                outcomes.append(schema.convert(value, path, **context.kwargs))
+            except Invalid as error:
+                outcomes.append(error)
+                if fail_fast:
+                    break
+        else:
+            pending.append((len(outcomes), schema._aconvert(value, path, context)))
+            outcomes.append(None)
+        if context.tick() or len(pending) >= context.yield_every:
+            await _settle(pending, outcomes)
+            pending = []
+    if pending:
+        await _settle(pending, outcomes)
+    return outcomes
+
+class _Patch(object):
+    """A new value in a patch tree. The other nodes are dicts of keys to subtrees."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+def _add_patch(tree, path, value):
+    if not path:
+        return _Patch(value)
+    if isinstance(tree, _Patch):
+        # Patches inside of a new value are applied to it right away.
+        tree.value = _apply_patches(None, tree.value, _add_patch({}, path, value), ())
+        return tree
+    tree[path[0]] = _add_patch(tree.get(path[0], {}), path[1:], value)
+    return tree
+
+def _apply_patches(schema, value, tree, path):
+    # Returns a patched copy of a value that gets converted as a whole.
+    if isinstance(tree, _Patch):
+        return tree.value
+    if isinstance(value, dict):
+        result = dict(value)
+        for key, subtree in tree.items():
+            if isinstance(subtree, _Patch):
+                if subtree.value is REMOVE:
+                    result.pop(key, None)
+                else:
+                    result[key] = subtree.value
+            elif key in result:
+                result[key] = _apply_patches(schema, result[key], subtree, Path(path, key))
+            else:
+                raise Invalid(schema, Path(path, key), "This value can't be patched.")
+        return result
+    if isinstance(value, (list, tuple)):
+        result = list(value)
+        _patch_list(schema, result, tree, path, lambda index, subtree: _apply_patches(
+            schema, value[index] if index < len(value) else None, subtree, Path(path, index)))
+        return result
+    raise Invalid(schema, path, "This value can't be patched.", bad_value=value)
+
+def _patch_list(schema, values, tree, path, update):
+    # Applies the patches to the list in place. The indices refer to the unpatched list
+    # and the indices after its end append. update(index, subtree) returns the new entry.
+    if not all(isinstance(index, int) and index >= 0 for index in tree):
+        raise Invalid(schema, path, 'Lists can only be patched by index.')
+    size = len(values)
+    removed = []
+    for index in sorted(tree):
+        subtree = tree[index]
+        remove = isinstance(subtree, _Patch) and subtree.value is REMOVE
+        if index < size:
+            if remove:
+                removed.append(index)
+            else:
+                values[index] = update(index, subtree)
+        elif index == len(values) and isinstance(subtree, _Patch) and not remove:
+            values.append(update(index, subtree))
+        else:
+            raise Invalid(schema, Path(path, index), "This value can't be patched.")
+    for index in reversed(removed):
+        del values[index]
+
+class Memo(object):
+    """Converts repeated sub-documents only once, see ``convert(value, memo=Memo())``.
+
+    ``Dict`` (also ``NamedTuple`` and ``DataClass``), ``List``, ``Tuple``,
+    ``Set`` and ``OneOf`` look up the values they convert in two scopes:
+
+    * By ``id()``, while converting the outermost of them. Values that are
+      referenced many times get converted once and the results are shared in the
+      same way. The references are dropped when that conversion is done.
+    * If ``cache_size`` is set, by content in an LRU cache of that many results
+      that is kept across calls. Only hashable values that can't be modified take
+      part: tuples (including named tuples) and frozensets of such values, frozen
+      dataclasses and scalars. Only results of those kinds get cached, e.g. a
+      tuple converted by ``List`` isn't, because the resulting list could be
+      modified by the caller. Results are only shared between calls with the same
+      keyword arguments.
+
+    ``id_hits``, ``id_misses``, ``content_hits`` and ``content_misses`` count the
+    lookups. Only successful conversions are remembered. A memo must not be used by
+    several threads at once.
+    """
+
+    def __init__(self, cache_size=0):
+        self.cache_size = cache_size
+        self.id_hits = self.id_misses = 0
+        self.content_hits = self.content_misses = 0
+        self._ids = {}
+        self._depth = 0
+        self._options = None
+        self._cache = OrderedDict()
+
+    def clear(self):
+        """Drops the cached results, but not the counters."""
+        self._cache.clear()
+
+    def _convert(self, convert, schema, value, path, kwargs):
+        if not self._depth:
+            self._options = None
+            if self.cache_size:
+                try:
+                    self._options = frozenset((name, option)
+                                              for name, option in kwargs.items()
+                                              if name not in ('memo', 'fail_fast'))
+                    hash(self._options)
+                except TypeError:
+                    self._options = None
+
+        key = (convert, id(schema), id(value))
+        entry = self._ids.get(key)
+        if entry is not None:
+            self.id_hits += 1
+            return entry[1]
+        self.id_misses += 1
+        content = None
+        if self._options is not None:
+            content = _content_key(value)
+            if content is not None:
+                content = (convert, schema, self._options, content)
+                result = self._cache.get(content, _UNDEFINED)
+                if result is not _UNDEFINED:
+                    self.content_hits += 1
+                    self._cache.move_to_end(content)
+                    self._ids[key] = (value, result)
+                    return result
+                self.content_misses += 1
+
+        self._depth += 1
+        try:
+            result = convert(schema, value, path, _memoized=True, **kwargs)
+            # The value is kept alive, so its id() can't be reused for another one.
+            self._ids[key] = (value, result)
+            if content is not None and _content_key(result) is not None:
+                self._cache[content] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return result
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self._ids.clear()
+
+class _ErrorLimit(object):
+    """Counts the errors for ``max_errors``.
+
+    It's passed on as ``fail_fast``, which becomes true once the limit is reached.
+    """
+    __slots__ = ('max_errors', '_errors')
+
+    def __init__(self, max_errors):
+        self.max_errors = max_errors
+        self._errors = set()
+
+    def __bool__(self):
+        return len(self._errors) >= self.max_errors
+
+    def add(self, error):
+        for children in error.children.values():
+            self._errors.update(children)
+
+    def discard(self, error):
+        for children in error.children.values():
+            self._errors.difference_update(children)
+
+def _count_errors(error, kwargs):
+    limit = kwargs.get('fail_fast')
+    if limit.__class__ is _ErrorLimit:
+        limit.add(error)
+    return error
+
+def _discard_errors(error, kwargs):
+    # Errors that get replaced by a default don't count.
+    limit = kwargs.get('fail_fast')
+    if limit.__class__ is _ErrorLimit:
+        limit.discard(error)
+
+class _BadValueRepr(str):
+    """A truncated ``repr()`` of a bad value, see ``bad_values='repr'``."""
+    __slots__ = ()
+
+    __repr__ = str.__str__
+
+_bad_value_repr = reprlib.Repr()
+_bad_value_repr.maxstring = _bad_value_repr.maxother = 80
+
+class _ErrorOptions(object):
+    """The ``max_errors`` and ``bad_values`` options, see ``Invalid``."""
+    __slots__ = ('max_errors', 'bad_values')
+
+    def __init__(self, kwargs):
+        # They're popped, so that the nested conversions don't apply them again.
+        self.max_errors = kwargs.pop('max_errors', None)
+        self.bad_values = kwargs.pop('bad_values', 'keep')
+        if self.bad_values not in ('keep', 'repr', 'drop'):
+            raise ValueError("bad_values must be 'keep', 'repr' or 'drop'.")
+        if self.max_errors is not None:
+            if self.max_errors < 1:
+                raise ValueError('max_errors must be at least 1.')
+            if not kwargs.get('fail_fast'):
+                kwargs['fail_fast'] = _ErrorLimit(self.max_errors)
+
+    def apply(self, error):
+        """Returns ``error`` with at most max_errors errors and the bad values handled."""
+        if self.max_errors is not None:
+            count = 0
+            for path, children in list(error.children.items()):
+                if count >= self.max_errors:
+                    del error.children[path]
+                    continue
+                del children[self.max_errors - count:]
+                count += len(children)
+        if self.bad_values == 'keep':
+            return error
+
+        errors = [error]
+        for children in error.children.values():
+            errors.extend(children)
+        for child in errors:
+            if child.bad_value is not _UNDEFINED and not isinstance(child.bad_value,
+                                                                    _BadValueRepr):
+                if self.bad_values == 'repr':
+                    child.bad_value = _BadValueRepr(_bad_value_repr.repr(child.bad_value))
+                else:
+                    child.bad_value = _UNDEFINED
+            cause = child
+            while cause is not None:
+                cause.__traceback__ = None
+                cause = cause.__cause__ or cause.__context__
+        return error
+
+def _content_key(value):
+    # Returns a key that only equal values of the same types share, or None if the
+    # value can be modified.
+    kind = type(value)
+    if kind in _PLAIN_TYPES:
+        return (kind, value)
+    if isinstance(value, tuple):
+        items = tuple(map(_content_key, value))
+        return None if None in items else (kind,) + items
+    if isinstance(value, frozenset):
+        items = frozenset(map(_content_key, value))
+        return None if None in items else (kind, items)
+    if (dataclasses is not None and dataclasses.is_dataclass(value) and
+            value.__dataclass_params__.frozen):
+        return _content_key((kind,) + dataclasses.astuple(value))
+    return None
 
 class Schema:
+    __slots__ = ('null', 'optional', 'default', 'use_default_for_invalid', 'validators')
     default_validators = []
 
     def __init__(self, null=False, optional=False, validators=None, default=_UNDEFINED,
@@ -235,48 +853,454 @@ class Schema:
         return self.default
 
     def convert(self, value, path=(), **kwargs):
+        if 'max_errors' in kwargs or 'bad_values' in kwargs:
+            options = _ErrorOptions(kwargs)
+            try:
+                return self.convert(value, path, **kwargs)
+            except Invalid as error:
+                # The traceback would keep this frame and so the value alive.
+                value = None
+                raise options.apply(error)
+
         # Forms can only represent empty strings, but not None. Convert empty strings.
-        if value == '':
+        if isinstance(value, str) and not value:
             value = None
 
         if value is None:
             if not self.null:
                 if self.use_default_for_invalid:
                     return self.get_default(path)
-                raise Invalid(self, path, 'This value is required.')
+                raise _count_errors(Invalid(self, path, 'This value is required.'), kwargs)
             return None
         try:
             value = self._convert(value, path, **kwargs)
-        except Invalid:
+        except Invalid as error:
             if self.use_default_for_invalid:
+                _discard_errors(error, kwargs)
                 return self.get_default(path)
+            _count_errors(error, kwargs)
             raise
 
         errors = []
         for validator in self.validators:
             try:
-                validator.check(value, path)
+                result = validator.check(value, path)
+                if result is not None and inspect.isawaitable(result):
+                    raise _async_check_error(validator, result)
             except Invalid as error:
                 if self.use_default_for_invalid:
                     return self.get_default(path)
                 errors.append(error)
+                if kwargs.get('fail_fast'):
+                    break
         if errors:
-            raise Invalid(self, path, children=errors, bad_value=value)
+            raise _count_errors(Invalid(self, path, children=errors, bad_value=value), kwargs)
         return value
 
     def _convert(self, value, path=(), **kwargs):
         raise NotImplementedError()
 
+    def is_valid(self, value):
+        """Returns whether ``value`` can be converted without errors.
+
+        This is a cheaper alternative to catching ``Invalid`` from ``convert()``. The
+        builtin schemas and validators stop at the first error and never build
+        an ``Invalid``.
+        """
+        return self._check_value(value) is not _INVALID
+
+    def _check_value(self, value):
+        if type(self).convert is not Schema.convert:
+            return self._check_fallback(value)
+        return self._check_validated(value)
+
+    def _check_validated(self, value):
+        # Mirrors convert(), but returns _INVALID instead of raising Invalid.
+        if isinstance(value, str) and not value:
+            value = None
+
+        if value is None:
+            if not self.null:
+                return self._check_default()
+            return None
+        value = self._check_convert(value)
+        if value is _INVALID:
+            return self._check_default()
+
+        for validator in self.validators:
+            if hasattr(validator, 'is_valid'):
+                valid = validator.is_valid(value)
+            else:
+                try:
+                    result = validator.check(value, ())
+                    if result is not None and inspect.isawaitable(result):
+                        raise _async_check_error(validator, result)
+                    valid = True
+                except Invalid:
+                    valid = False
+            if not valid:
+                return self._check_default()
+        return value
+
+    def _check_convert(self, value):
+        # Schemas without an exception-free implementation fall back to _convert().
+        try:
+            return self._convert(value, ())
+        except Invalid:
+            return _INVALID
+
+    def _check_default(self):
+        if self.use_default_for_invalid and self.has_default():
+            return self.get_default(())
+        return _INVALID
+
+    def _check_fallback(self, value):
+        try:
+            return self.convert(value)
+        except Invalid:
+            return _INVALID
+
+    async def aconvert(self, value, path=(), yield_every=1000, **kwargs):
+        """Same as ``convert()``, but also supports async validators.
+
+        An async validator is one whose ``check(value, path)`` is a coroutine function,
+        e.g. to look up whether a value is unique. The async checks of a value run
+        concurrently, and so do the entries of a ``Dict``, ``List``, ``Tuple`` or
+        ``Set`` that need async checks. Other parts of the schema get converted
+        synchronously. Every ``yield_every`` entries the event loop gets to run other
+        tasks, so converting large values doesn't block it.
+        """
+        if 'max_errors' in kwargs or 'bad_values' in kwargs:
+            options = _ErrorOptions(kwargs)
+            try:
+                return await self._aconvert(value, path, _AsyncContext(yield_every, kwargs))
+            except Invalid as error:
+                value = None
+                raise options.apply(error)
+        return await self._aconvert(value, path, _AsyncContext(yield_every, kwargs))
+
+    async def _aconvert(self, value, path, context):
+        if context.inline(self) or type(self).convert is not Schema.convert:
+            return self.convert(value, path, **context.kwargs)
+        return await self._aconvert_validated(value, path, context)
+
+    async def _aconvert_validated(self, value, path, context):
+        # Mirrors convert(), but awaits the conversion and the async validators.
+        if value is None or isinstance(value, str) and not value:
+            return self.convert(value, path, **context.kwargs)
+        try:
+            value = await self._aconvert_value(value, path, context)
+        except Invalid as error:
+            if self.use_default_for_invalid:
+                _discard_errors(error, context.kwargs)
+                return self.get_default(path)
+            _count_errors(error, context.kwargs)
+            raise
+
+        fail_fast = context.kwargs.get('fail_fast')
+        errors = []
+        checks = []
+        for position, validator in enumerate(self.validators):
+            if _is_async_validator(validator):
+                checks.append((position, validator.check(value, path)))
+                continue
+            try:
+                validator.check(value, path)
+            except Invalid as error:
+                errors.append((position, error))
+        if errors and (fail_fast or self.use_default_for_invalid):
+            for _, check in checks:
+                check.close()
+        elif checks:
+            outcomes = await _agather(check for _, check in checks)
+            errors.extend((position, outcome)
+                          for (position, _), outcome in zip(checks, outcomes)
+                          if isinstance(outcome, Invalid))
+        if errors:
+            if self.use_default_for_invalid:
+                return self.get_default(path)
+            errors = [error for _, error in sorted(errors, key=lambda error: error[0])]
+            raise _count_errors(Invalid(self, path, children=errors[:1] if fail_fast else errors,
+                                        bad_value=value), context.kwargs)
+        return value
+
+    async def _aconvert_value(self, value, path, context):
+        return self._convert(value, path, **context.kwargs)
+
+    def _subschemas(self):
+        return ()
+
+    def compile(self):
+        """Returns a function ``convert(value, path=())`` specialized for this schema.
+
+        The schema tree is walked once and turned into nested closures with the mode
+        checks resolved and constant validator bounds inlined. The results and
+        ``Invalid`` errors are the same as with ``convert()``. Changes made to the
+        schema after compiling are not picked up.
+        """
+        convert = self._compile({})
+
+        def compiled(value, path=()):
+            return convert(value, path)
+        return compiled
+
+    def _compile(self, memo):
+        # Shared and recursive subtrees are compiled only once. A recursive reference
+        # goes through a trampoline until the real converter is available.
+        key = id(self)
+        if key in memo:
+            return memo[key]
+        cell = []
+        memo[key] = lambda value, path: cell[0](value, path)
+        convert = self._compile_schema(memo)
+        cell.append(convert)
+        memo[key] = convert
+        return convert
+
+    def _compile_schema(self, memo):
+        if type(self).convert is not Schema.convert:
+            return self.convert
+        return self._compile_validated(self._compile_convert(memo))
+
+    def _compile_convert(self, memo):
+        return self._convert
+
+    def _compile_validated(self, convert_value):
+        schema = self
+        null = self.null
+        use_default = self.use_default_for_invalid
+        get_default = self.get_default
+        for validator in self.validators:
+            if _is_async_validator(validator):
+                raise TypeError(f'{validator!r} is async, use aconvert() instead.')
+        # Validators can provide a cheap predicate via _compile_check(). The full
+        # check() only runs if the predicate fails, so it raises the usual error.
+        checks = tuple((validator._compile_check()
+                        if hasattr(validator, '_compile_check') else None,
+                        validator.check)
+                       for validator in self.validators)
+
+        def convert_none(path):
+            if not null:
+                if use_default:
+                    return get_default(path)
+                raise Invalid(schema, path, 'This value is required.')
+            return None
+
+        if use_default:
+            def convert(value, path):
+                if value is None or isinstance(value, str) and not value:
+                    return convert_none(path)
+                try:
+                    value = convert_value(value, path)
+                except Invalid:
+                    return get_default(path)
+                for ok, check in checks:
+                    if ok is None or not ok(value):
+                        try:
+                            check(value, path)
+                        except Invalid:
+                            return get_default(path)
+                return value
+        elif checks:
+            def convert(value, path):
+                if value is None or isinstance(value, str) and not value:
+                    return convert_none(path)
+                value = convert_value(value, path)
+                errors = []
+                for ok, check in checks:
+                    if ok is None or not ok(value):
+                        try:
+                            check(value, path)
+                        except Invalid as error:
+                            errors.append(error)
+                if errors:
+                    raise Invalid(schema, path, children=errors, bad_value=value)
+                return value
+        else:
+            def convert(value, path):
+                if value is None or isinstance(value, str) and not value:
+                    return convert_none(path)
+                return convert_value(value, path)
+        return convert
+
+    def convert_json(self, source, path=(), **kwargs):
+        """Same as ``convert(json.loads(source))``, but converts while parsing.
+
+        ``source`` is JSON text as ``str`` or UTF-8 ``bytes``, or a file object that
+        gets read in chunks. The schema drives the parser: strings and numbers go
+        straight into the leaf schemas, keys that ``ignore_rest`` discards are
+        skipped without building their values, and with ``fail_fast=True`` parsing
+        stops at the first error. Malformed JSON raises ``json.JSONDecodeError``.
+        See ``schematic.jsonparse`` for the details.
+        """
+        from .jsonparse import convert_json
+        return convert_json(self, source, path, **kwargs)
+
+    def revalidate(self, value, patches, path=(), **kwargs):
+        """Converts ``value`` with the ``patches`` applied, reusing the unpatched parts.
+
+        ``value`` must be a result of ``convert()`` with this schema and doesn't get
+        modified. ``patches`` is an iterable of ``(path, new_value)`` pairs: the path
+        is a tuple of keys and list indices, and the raw ``new_value`` gets
+        converted like in ``convert()``. ``REMOVE`` as the new value removes the
+        entry. List indices refer to the unpatched list, the ones after its end
+        append. Only the new values are converted. Their ancestors are copied and
+        checked again (missing and unconverted keys, entry counts, validators),
+        everything else is reused as it is.
+        """
+        tree = {}
+        for patch_path, new_value in patches:
+            tree = _add_patch(tree, tuple(patch_path), new_value)
+        if 'max_errors' in kwargs or 'bad_values' in kwargs:
+            options = _ErrorOptions(kwargs)
+            try:
+                return self._revalidate(value, tree, path, kwargs)
+            except Invalid as error:
+                value = tree = None
+                raise options.apply(error)
+        return self._revalidate(value, tree, path, kwargs)
+
+    def _revalidate(self, old, tree, path, kwargs):
+        if isinstance(tree, _Patch):
+            return self.convert(tree.value, path, **kwargs)
+        if old is None or old is _UNDEFINED:
+            raise Invalid(self, path, "This value can't be patched.")
+        try:
+            value = self._revalidate_value(old, tree, path, kwargs)
+        except Invalid as error:
+            if self.use_default_for_invalid:
+                _discard_errors(error, kwargs)
+                return self.get_default(path)
+            _count_errors(error, kwargs)
+            raise
+        return self._validated(value, path, kwargs)
+
+    def _validated(self, value, path, kwargs):
+        # Runs the validators on an already converted value, like convert() does.
+        errors = []
+        for validator in self.validators:
+            try:
+                result = validator.check(value, path)
+                if result is not None and inspect.isawaitable(result):
+                    raise _async_check_error(validator, result)
+            except Invalid as error:
+                if self.use_default_for_invalid:
+                    return self.get_default(path)
+                errors.append(error)
+                if kwargs.get('fail_fast'):
+                    break
+        if errors:
+            raise _count_errors(Invalid(self, path, children=errors, bad_value=value), kwargs)
+        return value
+
+    def _revalidate_value(self, old, tree, path, kwargs):
+        # Schemas without a patch-aware implementation convert the patched value.
+        return self._convert(_apply_patches(self, old, tree, path), path, **kwargs)
+
+    def dump(self, value, as_json=False):
+        """Turns a converted value back into plain dicts, lists and ISO strings.
+
+        This only walks the structure of the schema: nothing gets parsed or
+        validated, so ``value`` must be valid, e.g. a result of ``convert()``. Records
+        (``NamedTuple``, ``DataClass``) become dicts, tuples and sets become lists and
+        dates and times become ISO 8601 strings. With ``as_json=True`` the result is
+        returned as a JSON string.
+
+        ``OneOf`` is the exception: it checks which of its choices a collection or
+        record fits (via its discriminator, if any) and raises ``Invalid`` if none
+        does, instead of dropping entries.
+        """
+        result = self._dump(value, True)
+        if as_json:
+            return json.dumps(result)
+        return result
+
+    def _dump(self, value, primitive):
+        # With primitive=False only records are turned into dicts (see to_dict()).
+        if primitive and isinstance(value, (date, time)):
+            return value.isoformat()
+        return value
+
+    def _accepts_type(self, kind):
+        # Returns False if _convert() rejects every value of the given type. This
+        # lets OneOf skip choices without trying them.
+        return True
+
     def get_validators(self, validator_type):
         return [v for v in self.validators if isinstance(v, validator_type)]
 
 class OneOf(Schema):
-    def __init__(self, choice=(), **kwargs):
+    """Converts the value with the first matching schema of ``choice``.
+
+    Normally the choices are tried in order. With ``discriminator``, a value that is
+    a dict is only tried against the ``Dict`` choices whose schema has a literal
+    equal to ``value[discriminator]`` (plus the choices without such a literal).
+    The lookup table is built when the schema is created. With ``index_types``,
+    choices that can't accept the value's type (e.g. a ``Dict`` for a list) are
+    skipped via a table that is built per input type. Both give the same results
+    as trying every choice.
+    """
+    __slots__ = ('choice', 'discriminator', 'index_types', '_positions', '_types', '_tags',
+                 '_untagged')
+    _caches = ('_types',)
+
+    def __init__(self, choice=(), discriminator=None, index_types=False, **kwargs):
         self.choice = list(choice)
+        self.discriminator = discriminator
+        self.index_types = index_types
+        self._positions = tuple(range(len(self.choice)))
+        self._types = {}
+        self._tags = None
+        if discriminator is not None:
+            self._build_tags()
         super().__init__(**kwargs)
 
+    def _build_tags(self):
+        tags = {}
+        untagged = []
+        for position, schema in enumerate(self.choice):
+            tag = _tag_literal(schema, self.discriminator)
+            if tag is _UNDEFINED:
+                untagged.append(position)
+                for positions in tags.values():
+                    positions.append(position)
+            else:
+                tags.setdefault(tag, list(untagged)).append(position)
+        self._tags = {tag: tuple(positions) for tag, positions in tags.items()}
+        self._untagged = tuple(untagged)
+
+    def _candidates(self, value):
+        # Returns the positions of the choices that might accept the value, in order.
+        positions = self._positions
+        if self._tags is not None:
+            positions = self._untagged
+            if isinstance(value, dict):
+                try:
+                    positions = self._tags.get(value[self.discriminator], positions)
+                except (KeyError, TypeError):
+                    pass
+        if self.index_types:
+            kind = type(value)
+            by_type = self._types.get(kind)
+            if by_type is None:
+                by_type = self._types[kind] = tuple(
+                    position for position, schema in enumerate(self.choice)
+                    if _may_accept_type(schema, kind))
+            if positions is not self._positions:
+                by_type = tuple(position for position in positions if position in by_type)
+            positions = by_type
+        return positions
+
     def _convert(self, value, path, **kwargs):
-        for schema in self.choice:
+        memo = kwargs.get('memo')
+        if memo is not None and not kwargs.pop('_memoized', False):
+            return memo._convert(OneOf._convert, self, value, path, kwargs)
+        # Errors of the tried schemas get discarded, so there's no point in collecting
+        # more than the first one.
+        trial_kwargs = dict(kwargs, fail_fast=True)
+        for position in self._candidates(value):
+            schema = self.choice[position]
             if isinstance(schema, (tuple, list)):
                 checker, schema = schema
                 try:
@@ -287,31 +1311,247 @@ class OneOf(Schema):
                 return schema.convert(value, path, **kwargs)
             else:
                 try:
-                    return schema.convert(value, path, **kwargs)
+                    return schema.convert(value, path, **trial_kwargs)
+                except Invalid:
+                    pass
+        raise Invalid(self, path, "This value doesn't match any acceptable schema.", bad_value=value)
+
+    async def _aconvert_value(self, value, path, context):
+        if type(self)._convert is not OneOf._convert:
+            return await super()._aconvert_value(value, path, context)
+        trial_context = context.derive(fail_fast=True)
+        for position in self._candidates(value):
+            schema = self.choice[position]
+            if isinstance(schema, (tuple, list)):
+                checker, schema = schema
+                try:
+                    if not checker(value):
+                        continue
+                except:
+                    continue
+                return await schema._aconvert(value, path, context)
+            else:
+                try:
+                    return await schema._aconvert(value, path, trial_context)
                 except Invalid:
                     pass
         raise Invalid(self, path, "This value doesn't match any acceptable schema.", bad_value=value)
 
+    def _subschemas(self):
+        return [schema[1] if isinstance(schema, (tuple, list)) else schema
+                for schema in self.choice]
+
+    def _dump(self, value, primitive):
+        # All scalar schemas dump the same way, only collections and records need the
+        # right choice. A choice for the value's exact record type wins, otherwise the
+        # first choice the value fits is used.
+        if (not isinstance(value, (dict, list, tuple, set, frozenset, array.array)) and
+                not _is_dataclass_instance(value)):
+            return super()._dump(value, primitive)
+        positions = self._candidates(value)
+        for position in positions:
+            schema = self.choice[position]
+            if not isinstance(schema, (tuple, list)) and _is_record_of(schema, value):
+                return schema._dump(value, primitive)
+        for position in positions:
+            schema = self.choice[position]
+            if isinstance(schema, (tuple, list)):
+                checker, schema = schema
+                try:
+                    if not checker(value):
+                        continue
+                except:
+                    continue
+            elif schema._check_value(value) is _INVALID:
+                continue
+            return schema._dump(value, primitive)
+        raise Invalid(self, (), "This value doesn't match any acceptable schema.",
+                      bad_value=value)
+
+    def _check_convert(self, value):
+        if type(self)._convert is not OneOf._convert:
+            return super()._check_convert(value)
+        for position in self._candidates(value):
+            schema = self.choice[position]
+            if isinstance(schema, (tuple, list)):
+                checker, schema = schema
+                try:
+                    if not checker(value):
+                        continue
+                except:
+                    continue
+                return schema._check_value(value)
+            result = schema._check_value(value)
+            if result is not _INVALID:
+                return result
+        return _INVALID
+
+    def _compile_convert(self, memo):
+        if type(self)._convert is not OneOf._convert:
+            return super()._compile_convert(memo)
+        schema = self
+        candidates = self._candidates
+        choices = []
+        for choice in self.choice:
+            if isinstance(choice, (tuple, list)):
+                checker, choice = choice
+                choices.append((checker, choice._compile(memo)))
+            else:
+                choices.append((None, choice._compile(memo)))
+
+        def convert_value(value, path):
+            for position in candidates(value):
+                checker, convert = choices[position]
+                if checker is not None:
+                    try:
+                        if not checker(value):
+                            continue
+                    except:
+                        continue
+                    return convert(value, path)
+                try:
+                    return convert(value, path)
+                except Invalid:
+                    pass
+            raise Invalid(schema, path, "This value doesn't match any acceptable schema.",
+                          bad_value=value)
+        return convert_value
+
+def _is_dataclass_instance(value):
+    return (dataclasses is not None and dataclasses.is_dataclass(value) and
+            not isinstance(value, type))
+
+def _is_record_of(schema, value):
+    # Returns whether the value is an instance of the schema's record type.
+    if isinstance(schema, NamedTuple):
+        return isinstance(value, schema.named_tuple)
+    if isinstance(schema, DataClass):
+        return isinstance(value, schema.data_class)
+    return False
+
+def _tag_literal(schema, key):
+    # Returns the literal a Dict choice requires for the key, or _UNDEFINED.
+    if (not isinstance(schema, Dict) or type(schema).convert is not Schema.convert or
+            type(schema)._convert is not Dict._convert or
+            not isinstance(schema.schema, dict) or schema.use_default_for_invalid):
+        return _UNDEFINED
+    literal = schema.schema.get(key, _UNDEFINED)
+    if isinstance(literal, Schema):
+        return _UNDEFINED
+    try:
+        hash(literal)
+    except TypeError:
+        return _UNDEFINED
+    return literal
+
+def _may_accept_type(schema, kind):
+    if isinstance(schema, (tuple, list)) or schema.use_default_for_invalid:
+        return True
+    return schema._accepts_type(kind)
+
 class NestedSchema(Schema):
+    __slots__ = ('schema', 'ignore_rest')
+
     def __init__(self, schema=None, ignore_rest=False, **kwargs):
         self.schema = schema
         self.ignore_rest = ignore_rest
         super().__init__(**kwargs)
 
+    def _subschemas(self):
+        if isinstance(self.schema, dict):
+            return [schema for schema in self.schema.values() if isinstance(schema, Schema)]
+        if isinstance(self.schema, (tuple, list)):
+            return self.schema
+        return () if self.schema is None else (self.schema,)
+
 class MissingEntry(Invalid):
     pass
 
+_PLAN_CACHE_SIZE = 32
+
+class _Plan(object):
+    """How a dict with certain keys lines up with the keys of a ``Dict`` schema.
+
+    Only keys are stored, so the entries (and their flags) are looked up on every
+    use. ``present`` tells for each key of the schema whether the dict has it,
+    ``unconverted`` holds the dict's keys that the schema doesn't expect, and
+    ``entries(fields)`` returns the entries of ``fields`` for the keys as a tuple
+    (or raises KeyError if one of them is gone).
+    """
+    __slots__ = ('keys', 'present', 'unconverted', 'entries')
+
+    def __init__(self, fields, value):
+        self.keys = keys = tuple(fields)
+        self.present = tuple(key in value for key in keys)
+        self.unconverted = tuple(key for key in value if key not in fields)
+        # Picklable (unlike lambdas), the plans get pickled with their Dict.
+        if len(keys) > 1:
+            self.entries = operator.itemgetter(*keys)
+        elif keys:
+            self.entries = functools.partial(_one_entry, keys[0])
+        else:
+            self.entries = _no_entries
+
+def _one_entry(key, fields):
+    return (fields[key],)
+
+def _no_entries(fields):
+    return ()
+
 class UnconvertedValues(Invalid):
     pass
 
+# The ways Dict._walk_fields() treats the present entries with a schema.
+def _defer_field(field, key, value, path):
+    return _UNDEFINED
+
+def _check_field(field, key, value, path):
+    return field._check_value(value)
+
 class Dict(NestedSchema):
+    """Converts a dict.
+
+    ``self.schema`` is either a ``(key_schema, value_schema)`` pair that is applied to
+    all items, or a dict of the expected keys to their schemas or literal values.
+
+    By default the result is always a new dict. With ``convert(value, copy=False)``
+    a dict (and any nested collection) is returned as it is when none of its
+    entries had to be changed, and scalars of the exact target type aren't coerced.
+
+    With ``convert(value, lazy=True)`` a dict of expected keys only gets its keys
+    and literals checked, and the result is a ``LazyDict`` that converts each
+    entry when it's first accessed.
+
+    For a dict of expected keys, which of them are present and which keys are
+    unexpected is cached per tuple of keys, so records with the same keys don't
+    repeat the lookups. Changes to ``self.schema``, its entries or ``ignore_rest``
+    are picked up.
+    """
+    __slots__ = ('_plans',)
+    _caches = ('_plans',)
+
+    def __init__(self, schema=None, ignore_rest=False, **kwargs):
+        super().__init__(schema, ignore_rest, **kwargs)
+        self._plans = (None, 0, {})
+
     def _convert(self, value, path, **kwargs):
+        memo = kwargs.get('memo')
+        if memo is not None and not kwargs.pop('_memoized', False):
+            return memo._convert(Dict._convert, self, value, path, kwargs)
         if not isinstance(value, dict):
             raise Invalid(self, path, 'This value must be a dict.', bad_value=value)
 
         if self.schema is None:
+            if type(value) is dict and not kwargs.get('copy', True):
+                return value
             return dict(value)
 
+        if (kwargs.get('lazy') and isinstance(self.schema, dict) and
+                type(self)._convert is Dict._convert):
+            return self._convert_lazy(value, path, kwargs)
+
+        parallel = kwargs.pop('_parallel', None)
+        fail_fast = kwargs.get('fail_fast')
         errors = []
         result = {}
         # We support two modes of operation.
@@ -321,71 +1561,701 @@ class Dict(NestedSchema):
         #    In this case self.schema is a dict.
         if isinstance(self.schema, (tuple, list)):
             key_schema, value_schema = self.schema
-            for key, val in value.items():
+            items = value.items()
+            if parallel is not None:
+                # Only the failed items get converted again here, to build the errors.
+                items = list(items)
+                pairs, failed = _convert_parallel(tuple(self.schema), items, parallel,
+                                                  kwargs)
+                failed = set(failed)
+                result.update(pair for index, pair in enumerate(pairs)
+                              if index not in failed)
+                items = [items[index] for index in sorted(failed)]
+            for key, val in items:
+                subpath = Path(path, key)
                 try:
-                    result_key = key_schema.convert(key, path + (key,), **kwargs)
+                    result_key = key_schema.convert(key, subpath, **kwargs)
                 except Invalid as error:
                     errors.append(error)
+                    if fail_fast:
+                        break
                 try:
-                    result[result_key] = value_schema.convert(val, path + (key,), **kwargs)
+                    result_value = value_schema.convert(val, subpath, **kwargs)
                 except Invalid as error:
                     errors.append(error)
+                    if fail_fast:
+                        break
+                if not errors:
+                    result[result_key] = result_value
 
-                if errors:
-                    raise Invalid(self, path, children=errors, bad_value=value)
+            if errors:
+                raise Invalid(self, path, children=errors, bad_value=value)
         else:
-            seen = set()
-            for key, schema in self.schema.items():
-                try:
-                    if not isinstance(schema, Schema):
-                        seen.add(key)
-                        if key not in value or schema != value[key]:
-                            raise Invalid(self, path + (key,),
-                                          f'This value must be equal to {schema!r}.')
-                        result[key] = value[key]
-                        continue
-                    elif schema.optional and key not in value:
-                        continue
+            plan, entries = self._plan(value)
 
-                    seen.add(key)
+            def convert(field, key, subvalue, path):
+                return field.convert(subvalue, Path(path, key), **kwargs)
+            result = self._walk_fields(value, path, convert, errors, fail_fast,
+                                       zip(plan.keys, entries), plan.present)
+            self._fields_error(value, path, errors, plan.unconverted, fail_fast)
 
-                    if key not in value:
-                        if schema.has_default():
-                            result[key] = schema.get_default(path + (key,))
-                            continue
-                        raise MissingEntry(self, path + (key,),
-                                           f'The {key!r} entry is missing.')
-                    result[key] = schema.convert(value[key], path + (key,), **kwargs)
-                except Invalid as error:
-                    errors.append(error)
+        if not kwargs.get('copy', True) and type(value) is dict:
+            if len(result) == len(value) and all(
+                    result.get(key, _UNDEFINED) is val for key, val in value.items()):
+                return value
+        return result
+
+    def _plan(self, value):
+        # Returns the cached _Plan for a dict with value's keys and the current
+        # entries for it. Checking the cache costs O(1): a new self.schema or a
+        # changed number of entries starts a new cache, and if an entry was removed
+        # and another one added, a cached plan fails to look up the removed one.
+        # Adversarial inputs can't grow the cache beyond _PLAN_CACHE_SIZE, the
+        # oldest plan gets evicted.
+        fields = self.schema
+        cached, size, plans = self._plans
+        shape = tuple(value)
+        plan = plans.get(shape) if cached is fields and size == len(fields) else None
+        if plan is not None:
+            try:
+                return plan, plan.entries(fields)
+            except KeyError:
+                cached = None
+        if cached is not fields or size != len(fields):
+            plans = {}
+            self._plans = fields, len(fields), plans
+        elif len(plans) >= _PLAN_CACHE_SIZE:
+            try:
+                del plans[next(iter(plans))]
+            except (KeyError, RuntimeError, StopIteration):
+                # Another thread changed the cache in the meantime.
+                pass
+        plan = plans[shape] = _Plan(fields, value)
+        return plan, plan.entries(fields)
+
+    def _walk_fields(self, value, path, convert, errors, fail_fast=False, items=None,
+                     present=None):
+        # The second mode of _convert(), shared by all the ways a dict gets converted
+        # (eagerly, lazily, async, compiled, checked, revalidated or streamed): checks
+        # the literals, converts the present entries with convert(field, key, subvalue,
+        # path) and fills in the defaults of the missing ones. convert() raises Invalid
+        # or returns _INVALID for an entry that failed otherwise, anything else goes
+        # into the result. The entries are items (default: self.schema.items()), and
+        # present has a flag for each of them that tells whether value has its key.
+        #
+        # The errors get added to errors, for _fields_error(). With errors=None (the
+        # exception-free check), _INVALID is returned at the first problem instead.
+        result = {}
+        if items is None:
+            items = self.schema.items()
+        flags = None if present is None else iter(present)
+        for key, field in items:
+            if fail_fast and errors:
+                break
+            has = key in value if flags is None else next(flags)
+            try:
+                if not isinstance(field, Schema):
+                    if not has or field != value[key]:
+                        if errors is None:
+                            return _INVALID
+                        raise Invalid(self, Path(path, key),
+                                      'This value must be equal to {value!r}.',
+                                      params={'value': field})
+                    result[key] = value[key]
+                elif has:
+                    subvalue = convert(field, key, value[key], path)
+                    if subvalue is _INVALID:
+                        if errors is None:
+                            return _INVALID
+                        continue
+                    result[key] = subvalue
+                elif field.optional:
+                    continue
+                elif field.has_default():
+                    result[key] = field.get_default(Path(path, key))
+                elif errors is None:
+                    return _INVALID
+                else:
+                    raise MissingEntry(self, Path(path, key), 'The {key!r} entry is missing.',
+                                       params={'key': key})
+            except Invalid as error:
+                if errors is None:
+                    return _INVALID
+                errors.append(error)
+        return result
+
+    def _fields_error(self, value, path, errors, unconverted, fail_fast=False):
+        # Raises the errors of _walk_fields() together with the unexpected keys that
+        # ignore_rest doesn't allow, if there are any.
+        error = None
+        if unconverted and not self.ignore_rest and not (fail_fast and errors):
+            error = UnconvertedValues(self, path, 'Unconverted values: {keys!j}',
+                                      bad_value=value, params={'keys': set(unconverted)})
+        if errors:
+            if not error:
+                error = Invalid(self, path, bad_value=value)
+            error.add(errors)
+        if error is not None:
+            raise error
+
+    def _unconverted(self, value, fields=None):
+        # The keys of value that fields (default: self.schema) doesn't expect.
+        if fields is None:
+            fields = self.schema
+        return [key for key in value if key not in fields]
+
+    def _convert_lazy(self, value, path, kwargs):
+        # Like the second mode of _convert(), but leaves the entries with a schema to
+        # the LazyDict.
+        fail_fast = kwargs.get('fail_fast')
+        errors = []
+        result = self._walk_fields(value, path, _defer_field, errors, fail_fast)
+        self._fields_error(value, path, errors, self._unconverted(value), fail_fast)
+        fixed = {key: val for key, val in result.items() if val is not _UNDEFINED}
+        return LazyDict(self, value, list(result), fixed, path, kwargs)
+
+    async def _aconvert_value(self, value, path, context):
+        if type(self)._convert is not Dict._convert:
+            return await super()._aconvert_value(value, path, context)
+        return await self._aconvert_dict(value, path, context)
+
+    async def _aconvert_dict(self, value, path, context):
+        # Mirrors _convert(), but the entries get converted via _aconvert_entries().
+        kwargs = context.kwargs
+        if not isinstance(value, dict) or self.schema is None:
+            return Dict._convert(self, value, path, **kwargs)
+
+        fail_fast = kwargs.get('fail_fast')
+        errors = []
+        result = {}
+        if isinstance(self.schema, (tuple, list)):
+            key_schema, value_schema = self.schema
+            entries = []
+            for key, val in value.items():
+                subpath = Path(path, key)
+                entries.append((key_schema, key, subpath))
+                entries.append((value_schema, val, subpath))
+            outcomes = await _aconvert_entries(entries, context)
+            for position, outcome in enumerate(outcomes):
+                if isinstance(outcome, Invalid):
+                    errors.append(outcome)
+                    if fail_fast:
+                        break
+                elif position % 2 and not errors:
+                    result[outcomes[position - 1]] = outcome
 
-            error = None
-            if not self.ignore_rest:
-                non_converted = set(value) - seen
-                if non_converted:
-                    error = UnconvertedValues(self, path,
-                        f"Unconverted values: {', '.join(non_converted)}",
-                        bad_value=value)
             if errors:
-                if not error:
-                    error = Invalid(self, path, bad_value=value)
-                error.add(errors)
-            if error is not None:
-                raise error
+                raise Invalid(self, path, children=errors, bad_value=value)
+        else:
+            keys = []
+            entries = []
+
+            def convert(field, key, subvalue, path):
+                # Keeps the order of the keys.
+                keys.append(key)
+                entries.append((field, subvalue, Path(path, key)))
+
+            result = self._walk_fields(value, path, convert, errors, fail_fast)
+            if not (fail_fast and errors):
+                for key, outcome in zip(keys, await _aconvert_entries(entries, context)):
+                    if isinstance(outcome, Invalid):
+                        errors.append(outcome)
+                        if fail_fast:
+                            break
+                    else:
+                        result[key] = outcome
+            self._fields_error(value, path, errors, self._unconverted(value), fail_fast)
 
         return result
 
-class IterableSchema(NestedSchema):
+    def convert_parallel(self, value, path=(), workers=None, chunk_size=None, **kwargs):
+        """Converts the items in a pool of worker processes.
+
+        Works like ``IterableSchema.convert_parallel()``, the ``Invalid`` paths are
+        the keys as with ``convert()``.
+        """
+        if not isinstance(self.schema, (tuple, list)):
+            raise TypeError('convert_parallel() needs a key/value schema.')
+        return self.convert(value, path, _parallel=(workers, chunk_size), **kwargs)
+
+    def convert_many(self, records, path=(), as_arrays=False, **kwargs):
+        """Converts a sequence of same-shaped records into a dict of columns.
+
+        The result maps every schema key to a list with one entry per record. The
+        values are the same as with ``convert()`` on each record, but records that
+        contain all schema keys are converted field by field. ``Date``, ``DateTime``
+        and ``Time`` columns parse every distinct string only once and, with NumPy
+        installed, ``Int``, ``Float`` and ``Bool`` columns and their ``MinValue``,
+        ``MaxValue`` and ``In`` checks are vectorized. Errors are reported with
+        ``(row_index, field)`` paths. With ``as_arrays=True`` the ``Int``,
+        ``Float`` and ``Bool`` columns are returned as NumPy arrays.
+        """
+        if not isinstance(self.schema, dict):
+            raise TypeError('convert_many() needs a dict schema.')
+        if as_arrays and numpy is None:
+            raise ImportError('as_arrays=True needs NumPy.')
+        if not isinstance(records, (list, tuple)):
+            records = list(records)
+
+        fail_fast = kwargs.get('fail_fast')
+        count = len(records)
+        columns = {key: [None] * count for key in self.schema}
+        errors = []
+        # Records that don't have exactly the schema keys (or that this schema can't
+        # convert per column) take the regular convert() path.
+        columnar = (type(self).convert is Schema.convert and
+                    type(self)._convert is Dict._convert and
+                    not self.validators and not self.use_default_for_invalid)
+        rows = []
+        for index, record in enumerate(records):
+            if columnar and self._has_all_keys(record):
+                rows.append(index)
+                continue
+            try:
+                result = self.convert(record, Path(path, index), **kwargs)
+            except Invalid as error:
+                errors.append(error)
+                if fail_fast:
+                    break
+                continue
+            if result is not None and not isinstance(result, dict):
+                result = result._asdict()
+            for key, column in columns.items():
+                column[index] = None if result is None else result.get(key)
+
+        if rows and not (fail_fast and errors):
+            for key, schema in self.schema.items():
+                values = [records[index][key] for index in rows]
+                if isinstance(schema, Schema):
+                    values = _convert_column(schema, values, rows, path, key, errors, kwargs)
+                column = columns[key]
+                for index, value in zip(rows, values):
+                    column[index] = value
+                if fail_fast and errors:
+                    break
+
+        if errors:
+            raise Invalid(self, path, children=errors, bad_value=records)
+        if as_arrays:
+            for key, schema in self.schema.items():
+                if type(schema) in _VECTOR_TYPES:
+                    columns[key] = numpy.array(columns[key])
+        return columns
+
+    def _convert_record(self, values, value, path, kwargs):
+        # Converts the field values of a record that has exactly the schema's fields
+        # (see _has_all_keys()), given in schema order. Returns them as a list.
+        fail_fast = kwargs.get('fail_fast')
+        errors = []
+        result = []
+        for (key, schema), subvalue in zip(self.schema.items(), values):
+            if not isinstance(schema, Schema):
+                result.append(subvalue)
+                continue
+            try:
+                result.append(schema.convert(subvalue, Path(path, key), **kwargs))
+            except Invalid as error:
+                errors.append(error)
+                if fail_fast:
+                    break
+        if errors:
+            error = Invalid(self, path, bad_value=value)
+            error.add(errors)
+            raise error
+        return result
+
+    def _has_all_keys(self, record):
+        if not isinstance(record, dict):
+            return False
+        if not self.ignore_rest and len(record) != len(self.schema):
+            return False
+        for key, schema in self.schema.items():
+            if key not in record:
+                return False
+            if not isinstance(schema, Schema) and schema != record[key]:
+                return False
+        return True
+
+    def _check_convert(self, value):
+        if type(self)._convert is not Dict._convert:
+            return super()._check_convert(value)
+        return self._check_dict(value)
+
+    def _accepts_type(self, kind):
+        if type(self).convert is not Schema.convert or type(self)._convert is not Dict._convert:
+            return super()._accepts_type(kind)
+        return issubclass(kind, dict)
+
+    def _revalidate_value(self, old, tree, path, kwargs):
+        if (type(self)._convert is not Dict._convert or self.schema is None or
+                not isinstance(old, dict)):
+            return super()._revalidate_value(old, tree, path, kwargs)
+        return self._revalidate_dict(old, tree, path, kwargs)
+
+    def _revalidate_dict(self, old, tree, path, kwargs):
+        fail_fast = kwargs.get('fail_fast')
+        items = isinstance(self.schema, (tuple, list))
+        errors = []
+        result = dict(old)
+        for key, subtree in tree.items():
+            subpath = Path(path, key)
+            try:
+                if isinstance(subtree, _Patch) and subtree.value is REMOVE:
+                    result.pop(key, None)
+                elif items:
+                    key_schema, value_schema = self.schema
+                    if key not in old:
+                        key = key_schema.convert(key, subpath, **kwargs)
+                    result[key] = value_schema._revalidate(old.get(key, _UNDEFINED), subtree,
+                                                           subpath, kwargs)
+                else:
+                    schema = self.schema.get(key, _UNDEFINED)
+                    if isinstance(schema, Schema):
+                        result[key] = schema._revalidate(old.get(key, _UNDEFINED), subtree,
+                                                         subpath, kwargs)
+                    elif not isinstance(subtree, _Patch):
+                        raise Invalid(self, subpath, "This value can't be patched.")
+                    elif schema is not _UNDEFINED and schema != subtree.value:
+                        raise Invalid(self, subpath, 'This value must be equal to {value!r}.',
+                                      params={'value': schema})
+                    else:
+                        result[key] = subtree.value
+            except Invalid as error:
+                errors.append(error)
+                if fail_fast:
+                    break
+
+        non_converted = ()
+        if not items:
+            # Only the patched keys can be missing or unconverted now.
+            removed = [(key, self.schema[key]) for key in tree
+                       if key in self.schema and key not in result]
+            result.update(self._walk_fields(result, path, None, errors, fail_fast, removed))
+            non_converted = {key for key in tree if key in result and key not in self.schema}
+            if self.ignore_rest:
+                for key in non_converted:
+                    del result[key]
+        self._fields_error(result, path, errors, non_converted, fail_fast)
+        return result
+
+    def _dump(self, value, primitive):
+        if value is None or self.schema is None:
+            return None if value is None else dict(value)
+        if isinstance(self.schema, (tuple, list)):
+            key_schema, value_schema = self.schema
+            return {key_schema._dump(key, primitive): value_schema._dump(val, primitive)
+                    for key, val in value.items()}
+        return self._dump_fields(value.items(), primitive)
+
+    def _dump_fields(self, items, primitive):
+        result = {}
+        for key, val in items:
+            schema = self.schema.get(key, _UNDEFINED)
+            if isinstance(schema, Schema):
+                result[key] = schema._dump(val, primitive)
+            elif schema is not _UNDEFINED:
+                result[key] = val
+        return result
+
+    def _check_dict(self, value):
+        if not isinstance(value, dict):
+            return _INVALID
+
+        if self.schema is None:
+            return dict(value)
+
+        result = {}
+        if isinstance(self.schema, (tuple, list)):
+            key_schema, value_schema = self.schema
+            for key, val in value.items():
+                result_key = key_schema._check_value(key)
+                if result_key is _INVALID:
+                    return _INVALID
+                result_value = value_schema._check_value(val)
+                if result_value is _INVALID:
+                    return _INVALID
+                result[result_key] = result_value
+            return result
+
+        if not self.ignore_rest and self._unconverted(value):
+            return _INVALID
+        return self._walk_fields(value, (), _check_field, None)
+
+    def _compile_convert(self, memo):
+        if type(self)._convert is not Dict._convert:
+            return super()._compile_convert(memo)
+        return self._compile_dict(memo)
+
+    def _compile_dict(self, memo):
+        schema = self
+        if self.schema is None:
+            def convert_value(value, path):
+                if not isinstance(value, dict):
+                    raise Invalid(schema, path, 'This value must be a dict.', bad_value=value)
+                return dict(value)
+            return convert_value
+        if isinstance(self.schema, (tuple, list)):
+            return self._compile_items(memo)
+        return self._compile_fields(memo)
+
+    def _compile_items(self, memo):
+        schema = self
+        key_schema, value_schema = self.schema
+        convert_key = key_schema._compile(memo)
+        convert_val = value_schema._compile(memo)
+
+        def convert_value(value, path):
+            if not isinstance(value, dict):
+                raise Invalid(schema, path, 'This value must be a dict.', bad_value=value)
+            errors = []
+            result = {}
+            for key, val in value.items():
+                subpath = Path(path, key)
+                try:
+                    result_key = convert_key(key, subpath)
+                except Invalid as error:
+                    errors.append(error)
+                try:
+                    result_value = convert_val(val, subpath)
+                except Invalid as error:
+                    errors.append(error)
+                if not errors:
+                    result[result_key] = result_value
+            if errors:
+                raise Invalid(schema, path, children=errors, bad_value=value)
+            return result
+        return convert_value
+
+    def _compile_fields(self, memo):
+        schema = self
+        fields = tuple(self.schema.items())
+        keys = frozenset(self.schema)
+        converters = {key: field._compile(memo) for key, field in fields
+                      if isinstance(field, Schema)}
+
+        def convert(field, key, subvalue, path):
+            return converters[key](subvalue, Path(path, key))
+
+        def convert_value(value, path):
+            if not isinstance(value, dict):
+                raise Invalid(schema, path, 'This value must be a dict.', bad_value=value)
+            errors = []
+            result = schema._walk_fields(value, path, convert, errors, items=fields)
+            schema._fields_error(value, path, errors, schema._unconverted(value, keys))
+            return result
+        return convert_value
+
+class LazyDict(Mapping):
+    """The result of ``Dict.convert(value, lazy=True)``.
+
+    A read-only mapping with the same keys as the eagerly converted dict. Each
+    entry gets converted (with the same options, so nested dicts are lazy, too)
+    and cached when it's first accessed, which raises the entry's ``Invalid`` if
+    it's invalid. Comparing, iterating over the values or dumping it converts
+    all of them.
+    """
+    __slots__ = ('_schema', '_value', '_keys', '_fixed', '_values', '_complete', '_path',
+                 '_kwargs')
+
+    def __init__(self, schema, value, keys, fixed, path, kwargs):
+        self._schema = schema
+        self._value = value
+        self._keys = dict.fromkeys(keys)
+        # The literals and defaults, and the entries converted so far.
+        self._fixed = fixed
+        self._values = dict(fixed)
+        # The keys whose values don't contain lazy dicts, for materialize().
+        self._complete = set(fixed)
+        self._path = path
+        self._kwargs = kwargs
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if key not in self._keys:
+            raise KeyError(key)
+        value = self._schema.schema[key].convert(self._value[key], Path(self._path, key),
+                                                 **self._kwargs)
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return '<LazyDict with {} of {} entries converted>'.format(
+            len(self._values), len(self._keys))
+
+    @property
+    def pending(self):
+        """The keys of the entries that haven't been converted yet."""
+        return {key for key in self._keys if key not in self._values}
+
+    def materialize(self):
+        """Converts the remaining entries and returns the result as a plain dict.
+
+        This validates the whole value and raises the same ``Invalid`` as an eager
+        ``convert()``. Entries that were accessed already aren't converted again,
+        only the lazy dicts in them get materialized. Collections whose schema can
+        produce lazy dicts below their entries (e.g. a list of dicts) get converted
+        again, without ``lazy``.
+        """
+        schema = self._schema
+        kwargs = dict(self._kwargs, lazy=False)
+        fail_fast = kwargs.get('fail_fast')
+        errors = []
+        result = {}
+        for key in self._keys:
+            value = self._values.get(key, _UNDEFINED)
+            if key not in self._complete:
+                try:
+                    if isinstance(value, LazyDict):
+                        value = value.materialize()
+                    elif value is _UNDEFINED or (
+                            isinstance(value, (Mapping, list, tuple, set)) and
+                            _may_be_lazy(schema.schema[key])):
+                        value = schema.schema[key].convert(self._value[key],
+                                                           Path(self._path, key), **kwargs)
+                except Invalid as error:
+                    errors.append(error)
+                    if fail_fast:
+                        break
+                    continue
+            result[key] = value
+        if errors:
+            raise Invalid(schema, self._path, children=errors, bad_value=self._value)
+        self._values.update(result)
+        self._complete.update(result)
+        return result
+
+def _may_be_lazy(schema, seen=None):
+    # Whether a value converted by the schema with lazy=True can contain lazy dicts.
+    if seen is None:
+        seen = set()
+    if id(schema) in seen:
+        return False
+    seen.add(id(schema))
+    if type(schema)._convert is Dict._convert and isinstance(schema.schema, dict):
+        return True
+    return any(_may_be_lazy(subschema, seen) for subschema in schema._subschemas()
+               if isinstance(subschema, Schema))
+
+class IterableSchema(NestedSchema):
+    """Converts an iterable.
+
+    ``self.schema`` is either a schema that is applied to all entries, or a tuple of
+    the schemas of a fixed number of entries.
+
+    With ``as_array=True`` and an ``Int`` or ``Float`` schema for all entries, the
+    result is an ``array.array`` of int64 or double values instead, and with
+    ``as_array='numpy'`` a NumPy array with the same dtype. Lists of exact ints or
+    floats, and buffers (``bytes``, ``memoryview``, arrays), are packed and checked
+    against the schema's ``MinValue`` and ``MaxValue`` as a whole. Bytes are read
+    as packed native values, other buffers must already have the right item type.
+    Other input and other validators fall back to converting the entries one by
+    one. With ``copy=False`` an array of the right type is returned as it is, and
+    a NumPy result can share the memory of the input buffer.
+    """
+    __slots__ = ('as_array',)
     _type_error = None
     _type = None
 
+    def __init__(self, schema=None, ignore_rest=False, as_array=False, **kwargs):
+        super().__init__(schema, ignore_rest, **kwargs)
+        self.as_array = as_array
+        if as_array:
+            if self._type is set or _array_types(schema) is None or schema.null:
+                raise TypeError('as_array needs a List or Tuple of non-null Int or Float.')
+            if as_array == 'numpy' and numpy is None:
+                raise ImportError("as_array='numpy' needs NumPy.")
+
+    def iter_convert(self, value, path=(), collect_errors=False, **kwargs):
+        """Converts the entries of an iterable one at a time and yields the results.
+
+        Neither the input nor the output gets stored, so this works on lazy and
+        unbounded sources in constant memory. The first invalid entry raises an
+        ``Invalid`` for this schema. With ``collect_errors=True`` the entry's
+        ``Invalid`` is yielded in place of the result and iteration continues.
+        Validators of this schema itself (e.g. ``MinLength``) need the whole value
+        and aren't run, and ``Set`` doesn't drop duplicate entries.
+        """
+        if not hasattr(value, '__iter__') or isinstance(value, str):
+            raise Invalid(self, path, self._type_error, bad_value=value)
+
+        if self.schema is None:
+            yield from value
+            return
+
+        ordered = isinstance(self.schema, (tuple, list))
+        index = -1
+        for index, subvalue in enumerate(value):
+            if not ordered:
+                schema = self.schema
+            elif index < len(self.schema):
+                schema = self.schema[index]
+            elif self.ignore_rest:
+                return
+            else:
+                break
+            try:
+                yield schema.convert(subvalue, Path(path, index), **kwargs)
+            except Invalid as error:
+                if not collect_errors:
+                    raise Invalid(self, path, children=[error])
+                yield error
+        else:
+            if not ordered or index + 1 == len(self.schema):
+                return
+
+        error = Invalid(self, path, 'This value must have {count} entries.',
+                        params={'count': len(self.schema)})
+        if not collect_errors:
+            raise error
+        yield error
+
+    def convert_parallel(self, value, path=(), workers=None, chunk_size=None, **kwargs):
+        """Converts the entries in a pool of worker processes.
+
+        The entries are split into chunks of ``chunk_size`` that ``workers`` processes
+        (default: one per CPU) convert with the compiled schema. The result and the
+        ``Invalid`` errors are the same as with ``convert()``, this schema's own
+        validators run on the merged result. Entries that fail in a worker get
+        converted again in this process to build their errors, so this is meant
+        for mostly valid input.
+
+        The schema and the keyword arguments get pickled, so they must not contain
+        lambdas or other local functions. Where processes are forked (the default
+        on Linux), schemas that can't be pickled are inherited by the workers
+        instead. The results must be picklable, too.
+        """
+        if self.schema is None or isinstance(self.schema, (tuple, list)):
+            raise TypeError('convert_parallel() needs a schema for all entries.')
+        return self.convert(value, path, _parallel=(workers, chunk_size), **kwargs)
+
     def _convert(self, value, path, **kwargs):
+        memo = kwargs.get('memo')
+        if memo is not None and not kwargs.pop('_memoized', False):
+            return memo._convert(IterableSchema._convert, self, value, path, kwargs)
         if not hasattr(value, '__iter__') or isinstance(value, str):
             raise Invalid(self, path, self._type_error, bad_value=value)
 
         if self.schema is None:
+            if type(value) is self._type and not kwargs.get('copy', True):
+                return value
             return self._type(value)
 
+        parallel = kwargs.pop('_parallel', None)
+        if self.as_array:
+            return self._convert_array(value, path, kwargs)
+        fail_fast = kwargs.get('fail_fast')
         errors = []
         result = []
 
@@ -398,50 +2268,308 @@ class IterableSchema(NestedSchema):
         if isinstance(self.schema, (tuple, list)):
             check_value = value[:len(self.schema)] if self.ignore_rest else value
             if len(check_value) != len(self.schema):
-                error = Invalid(self, path,
-                                f'This value must have {len(self.schema)} entries.',
-                                bad_value=value)
+                error = Invalid(self, path, 'This value must have {count} entries.',
+                                bad_value=value, params={'count': len(self.schema)})
                 errors.append(error)
             else:
                 for index, subvalue in enumerate(check_value):
                     schema = self.schema[index]
                     try:
-                        result.append(schema.convert(subvalue, path + (index,), **kwargs))
+                        result.append(schema.convert(subvalue, Path(path, index), **kwargs))
                     except Invalid as error:
                         errors.append(error)
+                        if fail_fast:
+                            break
+        elif parallel is not None:
+            # Only the failed entries get converted again here, to build the errors.
+            value = list(value)
+            result, failed = _convert_parallel(self.schema, value, parallel, kwargs)
+            for index in failed:
+                try:
+                    result[index] = self.schema.convert(value[index], Path(path, index),
+                                                        **kwargs)
+                except Invalid as error:
+                    errors.append(error)
+                    if fail_fast:
+                        break
         else:
             for index, subvalue in enumerate(value):
                 try:
-                    result.append(self.schema.convert(subvalue, path + (index,), **kwargs))
+                    result.append(self.schema.convert(subvalue, Path(path, index), **kwargs))
                 except Invalid as error:
                     errors.append(error)
+                    if fail_fast:
+                        break
+
+        if errors:
+            raise Invalid(self, path, children=errors, bad_value=value)
+
+        if not kwargs.get('copy', True) and type(value) is self._type:
+            if len(result) == len(value) and all(map(operator.is_, result, value)):
+                return value
+        return self._type(result)
+
+    def _convert_array(self, value, path, kwargs):
+        # Input that can be packed as it is only gets its bounds checked as a whole.
+        schema = self.schema
+        typecode, dtype = _array_types(schema)
+        exact = _packs_exactly(schema)
+        buffer = _array_buffer(value, typecode)
+        if buffer is not None:
+            if buffer.format != typecode:
+                raise Invalid(self, path, 'This value must be a multiple of {size} bytes.',
+                              bad_value=value, params={'size': struct.calcsize(typecode)})
+            if not exact:
+                packed = self._pack_entries(buffer, path, typecode, kwargs)
+            elif not kwargs.get('copy', True) and self._is_packed(value, typecode, dtype):
+                packed = value
+            elif self.as_array == 'numpy':
+                # Shares the memory of the input until it's copied.
+                packed = numpy.frombuffer(buffer, dtype)
+                if kwargs.get('copy', True):
+                    packed = packed.copy()
+            else:
+                packed = array.array(typecode)
+                packed.frombytes(buffer.cast('B'))
+        elif exact and isinstance(value, (list, tuple)):
+            try:
+                packed = array.array(typecode, value)
+            except (TypeError, OverflowError):
+                packed = self._pack_entries(value, path, typecode, kwargs)
+        else:
+            packed = self._pack_entries(value, path, typecode, kwargs)
+
+        if exact and not _array_in_bounds(schema, packed):
+            # Let the entries raise their errors (or fall back to their default).
+            packed = self._pack_entries(packed.tolist(), path, typecode, kwargs)
+        if self.as_array == 'numpy' and isinstance(packed, array.array):
+            return numpy.frombuffer(packed, dtype)
+        return packed
+
+    def _is_packed(self, value, typecode, dtype):
+        if self.as_array == 'numpy':
+            return type(value) is numpy.ndarray and value.dtype == dtype
+        return type(value) is array.array and value.typecode == typecode
+
+    def _pack_entries(self, values, path, typecode, kwargs):
+        schema = self.schema
+        fail_fast = kwargs.get('fail_fast')
+        errors = []
+        result = array.array(typecode)
+        append = result.append
+        for index, subvalue in enumerate(values):
+            subpath = Path(path, index)
+            try:
+                subvalue = schema.convert(subvalue, subpath, **kwargs)
+                try:
+                    append(subvalue)
+                except OverflowError:
+                    raise Invalid(schema, subpath, 'This value is out of range.',
+                                  bad_value=subvalue)
+            except Invalid as error:
+                errors.append(error)
+                if fail_fast:
+                    break
+        if errors:
+            raise Invalid(self, path, children=errors, bad_value=values)
+        return result
+
+    async def _aconvert_value(self, value, path, context):
+        if type(self)._convert is not IterableSchema._convert or self.as_array:
+            return await super()._aconvert_value(value, path, context)
+        if not hasattr(value, '__iter__') or isinstance(value, str) or self.schema is None:
+            return IterableSchema._convert(self, value, path, **context.kwargs)
+
+        if isinstance(self.schema, (tuple, list)):
+            check_value = value[:len(self.schema)] if self.ignore_rest else value
+            if len(check_value) != len(self.schema):
+                return IterableSchema._convert(self, value, path, **context.kwargs)
+            entries = ((schema, subvalue, Path(path, index)) for index, (schema, subvalue)
+                       in enumerate(zip(self.schema, check_value)))
+        else:
+            entries = ((self.schema, subvalue, Path(path, index))
+                       for index, subvalue in enumerate(value))
+
+        fail_fast = context.kwargs.get('fail_fast')
+        errors = []
+        result = []
+        for outcome in await _aconvert_entries(entries, context):
+            if isinstance(outcome, Invalid):
+                errors.append(outcome)
+                if fail_fast:
+                    break
+            else:
+                result.append(outcome)
 
         if errors:
             raise Invalid(self, path, children=errors, bad_value=value)
 
         return self._type(result)
 
+    def _accepts_type(self, kind):
+        if (type(self).convert is not Schema.convert or
+                type(self)._convert is not IterableSchema._convert):
+            return super()._accepts_type(kind)
+        return hasattr(kind, '__iter__') and not issubclass(kind, str)
+
+    def _revalidate_value(self, old, tree, path, kwargs):
+        if self.as_array:
+            # Arrays get patched as lists and packed again.
+            return super()._revalidate_value(old.tolist(), tree, path, kwargs)
+        if (type(self)._convert is not IterableSchema._convert or self.schema is None or
+                not isinstance(old, (list, tuple))):
+            return super()._revalidate_value(old, tree, path, kwargs)
+        ordered = isinstance(self.schema, (tuple, list))
+        values = list(old)
+        errors = []
+
+        def update(index, subtree):
+            if not ordered:
+                schema = self.schema
+            elif index < len(self.schema):
+                schema = self.schema[index]
+            else:
+                # The entry count check below fails.
+                return None
+            try:
+                return schema._revalidate(old[index] if index < len(old) else _UNDEFINED,
+                                          subtree, Path(path, index), kwargs)
+            except Invalid as error:
+                errors.append(error)
+
+        _patch_list(self, values, tree, path, update)
+        if ordered and len(values) != len(self.schema):
+            errors.append(Invalid(self, path, 'This value must have {count} entries.',
+                                  params={'count': len(self.schema)}))
+        if errors:
+            raise Invalid(self, path, children=errors, bad_value=values)
+        return self._type(values)
+
+    def _dump(self, value, primitive):
+        if value is None:
+            return None
+        if self.as_array:
+            return value.tolist() if primitive else copy.copy(value)
+        _type = list if primitive else self._type
+        if self.schema is None:
+            return _type(value)
+        if isinstance(self.schema, (tuple, list)):
+            return _type(schema._dump(subvalue, primitive)
+                         for schema, subvalue in zip(self.schema, value))
+        dump = self.schema._dump
+        return _type(dump(subvalue, primitive) for subvalue in value)
+
+    def _check_convert(self, value):
+        if type(self)._convert is not IterableSchema._convert or self.as_array:
+            return super()._check_convert(value)
+        if not hasattr(value, '__iter__') or isinstance(value, str):
+            return _INVALID
+
+        if self.schema is None:
+            return self._type(value)
+
+        result = []
+        if isinstance(self.schema, (tuple, list)):
+            check_value = value[:len(self.schema)] if self.ignore_rest else value
+            if len(check_value) != len(self.schema):
+                return _INVALID
+            pairs = zip(self.schema, check_value)
+        else:
+            pairs = ((self.schema, subvalue) for subvalue in value)
+        for schema, subvalue in pairs:
+            subvalue = schema._check_value(subvalue)
+            if subvalue is _INVALID:
+                return _INVALID
+            result.append(subvalue)
+        return self._type(result)
+
+    def _compile_convert(self, memo):
+        if type(self)._convert is not IterableSchema._convert or self.as_array:
+            return super()._compile_convert(memo)
+        schema = self
+        _type = self._type
+        type_error = self._type_error
+
+        if self.schema is None:
+            def convert_value(value, path):
+                if not hasattr(value, '__iter__') or isinstance(value, str):
+                    raise Invalid(schema, path, type_error, bad_value=value)
+                return _type(value)
+        elif isinstance(self.schema, (tuple, list)):
+            converters = tuple(subschema._compile(memo) for subschema in self.schema)
+            count = len(converters)
+            ignore_rest = self.ignore_rest
+
+            def convert_value(value, path):
+                if not hasattr(value, '__iter__') or isinstance(value, str):
+                    raise Invalid(schema, path, type_error, bad_value=value)
+                check_value = value[:count] if ignore_rest else value
+                if len(check_value) != count:
+                    error = Invalid(schema, path, 'This value must have {count} entries.',
+                                    bad_value=value, params={'count': count})
+                    raise Invalid(schema, path, children=[error], bad_value=value)
+                errors = []
+                result = []
+                for index, (convert, subvalue) in enumerate(zip(converters, check_value)):
+                    try:
+                        result.append(convert(subvalue, Path(path, index)))
+                    except Invalid as error:
+                        errors.append(error)
+                if errors:
+                    raise Invalid(schema, path, children=errors, bad_value=value)
+                return _type(result)
+        else:
+            convert = self.schema._compile(memo)
+
+            def convert_value(value, path):
+                if not hasattr(value, '__iter__') or isinstance(value, str):
+                    raise Invalid(schema, path, type_error, bad_value=value)
+                errors = []
+                result = []
+                append = result.append
+                for index, subvalue in enumerate(value):
+                    try:
+                        append(convert(subvalue, Path(path, index)))
+                    except Invalid as error:
+                        errors.append(error)
+                if errors:
+                    raise Invalid(schema, path, children=errors, bad_value=value)
+                return _type(result)
+        return convert_value
+
 class List(IterableSchema):
+    __slots__ = ()
     _type_error = 'This value must be a list.'
     _type = list
 
 class Tuple(IterableSchema):
+    __slots__ = ()
     _type_error = 'This value must be a tuple.'
     _type = tuple
 
 class Set(IterableSchema):
+    __slots__ = ()
     _type_error = 'This value must be a set.'
     _type = set
 
 class Generic(Schema):
+    __slots__ = ()
+
     def _convert(self, value, path, **kwargs):
         if not isinstance(value, str):
             value = value.decode('utf-8')
         return value
 
+def _to_str(value):
+    return value if isinstance(value, str) else bytes(value).decode('utf-8')
+
+def _to_bytes(value):
+    return value.encode('utf-8') if isinstance(value, str) else bytes(value)
+
 class String(Schema):
+    __slots__ = ('blank', 'strip_whitespace')
     # Let's wrap the converter in a list, so it won't become a method.
-    _converters = [(lambda x: x if isinstance(x, str) else (bytes(x).decode('utf-8')))]
+    _converters = [_to_str]
 
     def __init__(self, blank=False, strip_whitespace=True, **kwargs):
         super().__init__(**kwargs)
@@ -452,12 +2580,12 @@ class String(Schema):
         # Check for blank
         if self.strip_whitespace and isinstance(value, str) and value:
             value = value.strip()
-        if value == '':
+        if isinstance(value, str) and not value:
             if self.blank:
                 return value
             if self.null:
                 return None
-            raise Invalid(self, path, 'This value is required.')
+            raise _count_errors(Invalid(self, path, 'This value is required.'), kwargs)
         return super().convert(value, path, **kwargs)
 
     def _convert(self, value, path, **kwargs):
@@ -465,15 +2593,69 @@ class String(Schema):
             value = converter(value)
         return value
 
+    def _check_value(self, value):
+        if type(self).convert is not String.convert:
+            return self._check_fallback(value)
+        if self.strip_whitespace and isinstance(value, str) and value:
+            value = value.strip()
+        if isinstance(value, str) and not value:
+            if self.blank:
+                return value
+            if self.null:
+                return None
+            return _INVALID
+        return self._check_validated(value)
+
+    async def _aconvert(self, value, path, context):
+        if context.inline(self) or type(self).convert is not String.convert:
+            return self.convert(value, path, **context.kwargs)
+        if self.strip_whitespace and isinstance(value, str) and value:
+            value = value.strip()
+        return await self._aconvert_validated(value, path, context)
+
+    def _compile_schema(self, memo):
+        if type(self).convert is not String.convert:
+            return super()._compile_schema(memo)
+        schema = self
+        convert = self._compile_validated(self._compile_convert(memo))
+        strip_whitespace = self.strip_whitespace
+        blank = self.blank
+        null = self.null
+
+        def convert_string(value, path):
+            if strip_whitespace and isinstance(value, str) and value:
+                value = value.strip()
+            if isinstance(value, str) and not value:
+                if blank:
+                    return value
+                if null:
+                    return None
+                raise Invalid(schema, path, 'This value is required.')
+            return convert(value, path)
+        return convert_string
+
+    def _compile_convert(self, memo):
+        if type(self)._convert is not String._convert:
+            return super()._compile_convert(memo)
+        converters = tuple(self._converters)
+        if len(converters) == 1:
+            converter = converters[0]
+            return lambda value, path: converter(value)
+        return self._convert
+
 class Blob(String):
-    _converters = [(lambda x: x.encode('utf-8') if isinstance(x, str) else bytes(x))]
+    __slots__ = ()
+    _converters = [_to_bytes]
 
 class Number(Schema):
+    __slots__ = ()
     # Let's wrap the converter in a list, so it won't become a method.
     _converters = []
     _error = None
 
     def _convert(self, value, path, **kwargs):
+        if not kwargs.get('copy', True) and type(value) in self._converters[-1:]:
+            return value
         try:
             for converter in self._converters:
                 value = converter(value)
@@ -481,23 +2663,262 @@ class Number(Schema):
         except (ValueError, TypeError) as e:
             raise Invalid(self, path, self._error)
 
+    def _check_convert(self, value):
+        if type(self)._convert is not Number._convert:
+            return super()._check_convert(value)
+        try:
+            for converter in self._converters:
+                value = converter(value)
+            return value
+        except (ValueError, TypeError):
+            return _INVALID
+
+    def _compile_convert(self, memo):
+        if type(self)._convert is not Number._convert or len(self._converters) != 1:
+            return super()._compile_convert(memo)
+        schema = self
+        converter = self._converters[0]
+        error = self._error
+
+        def convert_value(value, path):
+            try:
+                return converter(value)
+            except (ValueError, TypeError):
+                raise Invalid(schema, path, error)
+        return convert_value
+
 class Int(Number):
+    __slots__ = ()
     _converters = [int]
     _error = 'This value must be an integer.'
 
 class Float(Number):
+    __slots__ = ()
     _converters = [float]
     _error = 'This value must be a number.'
 
+# The array.array typecodes and NumPy dtypes for IterableSchema(as_array=...).
+_ARRAY_TYPES = ((Int, 'q', 'int64'), (Float, 'd', 'float64'))
+# Buffer formats that get read as packed values.
+_BYTE_FORMATS = {'B', 'b', 'c'}
+# Buffer formats that already have the item type of an array typecode.
+_ARRAY_FORMATS = {'q': {code for code in 'qln' if struct.calcsize(code) == 8}, 'd': {'d'}}
+
+def _array_types(schema):
+    for kind, typecode, dtype in _ARRAY_TYPES:
+        if isinstance(schema, kind):
+            return typecode, dtype
+    return None
+
+def _packs_exactly(schema):
+    # Whether packing the raw values and checking their bounds is the same as
+    # converting them one by one.
+    return (type(schema) in (Int, Float) and
+            all(type(validator) in (MinValue, MaxValue) for validator in schema.validators))
+
+def _array_buffer(value, typecode):
+    # Returns a flat memoryview of value's packed items if it's a buffer of bytes or
+    # of items of the typecode, otherwise None. Bytes that don't add up to whole
+    # items are returned as they are.
+    if isinstance(value, (list, tuple)):
+        return None
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return None
+    format = view.format.lstrip('@')
+    if (view.ndim != 1 or not view.c_contiguous or
+            format not in _BYTE_FORMATS and format not in _ARRAY_FORMATS[typecode]):
+        return None
+    view = view.cast('B')
+    if len(view) % struct.calcsize(typecode):
+        return view
+    return view.cast(typecode)
+
+def _array_in_bounds(schema, packed):
+    # Checks the MinValue and MaxValue of the schema on all the packed values at once.
+    if not schema.validators or not len(packed):
+        return True
+    # A NaN can't be compared as a whole. NumPy's min() and max() return NaN if
+    # there is one, the builtin ones don't, so only float arrays get checked for it.
+    # Their sum is NaN if there is one (the C loop of sum() is fast), but also if
+    # it contains (or overflows to) both infinities, so then the values get checked.
+    if isinstance(packed, array.array):
+        if (packed.typecode in 'fd' and math.isnan(sum(packed)) and
+                any(value != value for value in packed)):
+            return False
+        low, high = min(packed), max(packed)
+    else:
+        low, high = packed.min(), packed.max()
+        if low != low or high != high:
+            return False
+    for validator in schema.validators:
+        if type(validator) is MinValue and low < validator.get_value():
+            return False
+        if type(validator) is MaxValue and high > validator.get_value():
+            return False
+    return True
+
 class Bool(Schema):
+    __slots__ = ()
+
     def _convert(self, value, path, **kwargs):
         if isinstance(value, str):
             return value.lower() not in ('0', 'false')
         return bool(value)
 
+# Exact input types that can be passed to NumPy unchanged by convert_many().
+_VECTOR_TYPES = {
+    Int: ((int,), 'int64'),
+    Float: ((float, int), 'float64'),
+    Bool: ((bool,), 'bool'),
+}
+
+def _vectorize_column(schema, values):
+    # Returns the converted values and the positions that still need a full
+    # conversion, or None if the column can't be vectorized.
+    types, dtype = _VECTOR_TYPES.get(type(schema), (None, None))
+    if types is None or not values:
+        return None
+    for value in values:
+        if type(value) not in types:
+            return None
+    try:
+        array = numpy.array(values, dtype=dtype)
+    except OverflowError:
+        return None
+    ok = numpy.ones(len(values), dtype=bool)
+    for validator in schema.validators:
+        if type(validator) is MinValue:
+            ok &= ~(array < validator.get_value())
+        elif type(validator) is MaxValue:
+            ok &= ~(array > validator.get_value())
+        elif type(validator) is In:
+            choice = validator.get_value()
+            if not all(type(item) in (int, float, bool) for item in choice):
+                return None
+            ok &= numpy.isin(array, choice)
+        else:
+            return None
+    if type(schema) is Float:
+        values = array.tolist()
+    return values, numpy.flatnonzero(~ok).tolist()
+
+def _convert_column(schema, values, rows, path, key, errors, kwargs):
+    pending = range(len(values))
+    results = values
+    if numpy is not None:
+        vectorized = _vectorize_column(schema, values)
+        if vectorized is not None:
+            results, pending = vectorized
+    results = list(results)
+    convert = schema.compile() if not kwargs else schema.convert
+    # Parsing dates is expensive and columns usually repeat the same strings.
+    cache = {} if type(schema) in (DateTime, Date, Time) else None
+    for position in pending:
+        value = values[position]
+        if cache is not None and type(value) is str and value in cache:
+            results[position] = cache[value]
+            continue
+        try:
+            result = convert(value, Path(Path(path, rows[position]), key), **kwargs)
+        except Invalid as error:
+            errors.append(error)
+            if kwargs.get('fail_fast'):
+                break
+            continue
+        if cache is not None and type(value) is str:
+            cache[value] = result
+        results[position] = result
+    return results
+
+# Schemas that can't be pickled, inherited by forked worker processes.
+_parallel_schemas = {}
+_parallel_tokens = itertools.count()
+# The converter for the current token in a worker process.
+_worker_state = [None, None]
+
+def _convert_parallel(schema, values, parallel, kwargs):
+    """Converts ``values`` with ``schema`` (or a tuple of a key and value schema for
+    items) in worker processes and returns the results and the failed positions.
+    """
+    workers, chunk_size = parallel
+    workers = workers or os.cpu_count() or 1
+    if not chunk_size:
+        chunk_size = max(1, -(-len(values) // (workers * 4)))
+    chunks = [values[start:start + chunk_size]
+              for start in range(0, len(values), chunk_size)]
+    if len(chunks) <= 1 or workers <= 1:
+        return _convert_values(_chunk_converter(schema, kwargs), values, kwargs)
+
+    token = (os.getpid(), next(_parallel_tokens))
+    try:
+        data = pickle.dumps(schema, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        # Without allow_none, get_start_method() would fix the start method for good.
+        # The first of get_all_start_methods() is the default.
+        method = (multiprocessing.get_start_method(allow_none=True) or
+                  multiprocessing.get_all_start_methods()[0])
+        if method != 'fork':
+            raise
+        data = None
+        _parallel_schemas[token] = schema
+    try:
+        with ProcessPoolExecutor(workers) as executor:
+            chunk_results = list(executor.map(
+                functools.partial(_convert_chunk, token, data, kwargs), chunks))
+    finally:
+        _parallel_schemas.pop(token, None)
+
+    results = []
+    failed = []
+    for start, (chunk, chunk_failed) in zip(range(0, len(values), chunk_size),
+                                            chunk_results):
+        results.extend(chunk)
+        failed.extend(start + index for index in chunk_failed)
+    return results, failed
+
+def _chunk_converter(schema, kwargs):
+    if isinstance(schema, tuple):
+        convert_key, convert_value = (_chunk_converter(subschema, kwargs)
+                                      for subschema in schema)
+        return lambda item: (convert_key(item[0]), convert_value(item[1]))
+    if kwargs:
+        return lambda value: schema.convert(value, (), **kwargs)
+    convert = schema.compile()
+    return lambda value: convert(value, ())
+
+def _convert_chunk(token, data, kwargs, values):
+    # Runs in the worker processes.
+    if _worker_state[0] != token:
+        schema = _parallel_schemas[token] if data is None else pickle.loads(data)
+        _worker_state[:] = token, _chunk_converter(schema, kwargs)
+    return _convert_values(_worker_state[1], values, kwargs)
+
+def _convert_values(convert, values, kwargs):
+    # Failed positions get None as their result.
+    results = []
+    failed = []
+    for index, value in enumerate(values):
+        try:
+            results.append(convert(value))
+        except Invalid:
+            results.append(None)
+            failed.append(index)
+            if kwargs.get('fail_fast'):
+                results.extend([None] * (len(values) - len(results)))
+                break
+    return results, failed
+
 class DateTime(Schema):
-    def __init__(self, timezone_aware=True, **kwargs):
+    __slots__ = ('timezone_aware', 'remember_format', 'last_format')
+
+    def __init__(self, timezone_aware=True, remember_format=False, **kwargs):
         self.timezone_aware = timezone_aware
+        # Try the format that matched last time first. This assumes that no string
+        # matches more than one input format, which holds for the default formats.
+        self.remember_format = remember_format
+        self.last_format = None
         super().__init__(**kwargs)
 
     def _convert(self, value, path, **kwargs):
@@ -507,7 +2928,29 @@ class DateTime(Schema):
             raise Invalid(self, path, 'Please provide a datetime object.')
         return value
 
+    def _accepts_type(self, kind):
+        if type(self).convert is not Schema.convert or type(self)._convert is not DateTime._convert:
+            return super()._accepts_type(kind)
+        return issubclass(kind, (str, datetime))
+
+    def _check_convert(self, value):
+        if type(self)._convert is not DateTime._convert:
+            return super()._check_convert(value)
+        if isinstance(value, str):
+            result = _parse_datetime(value, self.timezone_aware, self)
+            return _INVALID if result is None else result
+        if not isinstance(value, datetime):
+            return _INVALID
+        return value
+
 class Date(Schema):
+    __slots__ = ('remember_format', 'last_format')
+
+    def __init__(self, remember_format=False, **kwargs):
+        self.remember_format = remember_format
+        self.last_format = None
+        super().__init__(**kwargs)
+
     def _convert(self, value, path, **kwargs):
         if isinstance(value, str):
             return parse_date(self, value, path)
@@ -517,7 +2960,31 @@ class Date(Schema):
             raise Invalid(self, path, 'Please provide a date object.')
         return value
 
+    def _accepts_type(self, kind):
+        if type(self).convert is not Schema.convert or type(self)._convert is not Date._convert:
+            return super()._accepts_type(kind)
+        return issubclass(kind, (str, date))
+
+    def _check_convert(self, value):
+        if type(self)._convert is not Date._convert:
+            return super()._check_convert(value)
+        if isinstance(value, str):
+            result = _parse_date(value, self)
+            return _INVALID if result is None else result
+        if isinstance(value, datetime):
+            return value.date()
+        if not isinstance(value, date):
+            return _INVALID
+        return value
+
 class Time(Schema):
+    __slots__ = ('remember_format', 'last_format')
+
+    def __init__(self, remember_format=False, **kwargs):
+        self.remember_format = remember_format
+        self.last_format = None
+        super().__init__(**kwargs)
+
     def _convert(self, value, path, **kwargs):
         if isinstance(value, str):
             return parse_time(self, value, path)
@@ -527,9 +2994,34 @@ class Time(Schema):
             raise Invalid(self, path, 'Please provide a time object.')
         return value
 
+    def _accepts_type(self, kind):
+        if type(self).convert is not Schema.convert or type(self)._convert is not Time._convert:
+            return super()._accepts_type(kind)
+        return issubclass(kind, (str, datetime, time))
+
+    def _check_convert(self, value):
+        if type(self)._convert is not Time._convert:
+            return super()._check_convert(value)
+        if isinstance(value, str):
+            result = _parse_time(value, self)
+            return _INVALID if result is None else result
+        if isinstance(value, datetime):
+            return value.time()
+        if not isinstance(value, time):
+            return _INVALID
+        return value
+
 class Email(String):
+    __slots__ = ()
     default_validators = [MaxLength(254), EmailValidator()]
 
+    def __init__(self, cache_size=None, **kwargs):
+        super().__init__(**kwargs)
+        # Use a cached validator of our own instead of the shared default one.
+        if cache_size:
+            self.validators = [EmailValidator(cache_size) if type(v) is EmailValidator
+                               else v for v in self.validators]
+
     def _convert(self, value, path, **kwargs):
         return value.lower()
 
@@ -554,42 +3046,164 @@ DATETIME_INPUT_FORMATS = (
     '%d.%m.%Y %H:%M',        # '25.10.2006 14:30'
 )
 
-def parse_datetime(schema, value, path, timezone_aware=True):
-    for spec in DATETIME_INPUT_FORMATS:
+# The same patterns that datetime.strptime() uses for the numeric directives.
+_DIRECTIVE_PATTERNS = {
+    'd': r'(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])',
+    'f': r'(?P<f>[0-9]{1,6})',
+    'H': r'(?P<H>2[0-3]|[0-1]\d|\d)',
+    'm': r'(?P<m>1[0-2]|0[1-9]|[1-9])',
+    'M': r'(?P<M>[0-5]\d|\d)',
+    'S': r'(?P<S>6[0-1]|[0-5]\d|\d)',
+    'y': r'(?P<y>\d\d)',
+    'Y': r'(?P<Y>\d\d\d\d)',
+}
+
+class _FormatParser(object):
+    """Parses strings like trying ``datetime.strptime()`` with each format in order.
+
+    A format is only tried if the string contains all of its non-letter literal
+    characters, so most formats are ruled out without a failed parse. Formats that
+    only use numeric directives are matched with a precompiled regex and the
+    datetime is built directly. The others are passed to ``strptime()``.
+    """
+
+    def __init__(self, formats):
+        self.formats = formats
+        self.entries = []
+        for spec in formats:
+            literals = set()
+            pattern = []
+            fast = True
+            index = 0
+            while index < len(spec):
+                char = spec[index]
+                if char == '%':
+                    if index + 1 == len(spec):
+                        fast = False
+                        break
+                    directive = spec[index + 1]
+                    index += 2
+                    if directive == '%':
+                        literals.add('%')
+                        pattern.append('%')
+                    elif directive in _DIRECTIVE_PATTERNS:
+                        pattern.append(_DIRECTIVE_PATTERNS[directive])
+                    else:
+                        fast = False
+                    continue
+                index += 1
+                if char.isspace():
+                    if not pattern or pattern[-1] != r'\s+':
+                        pattern.append(r'\s+')
+                    continue
+                if not char.isalpha():
+                    literals.add(char)
+                pattern.append(re.escape(char))
+            regex = re.compile(''.join(pattern), re.IGNORECASE) if fast else None
+            self.entries.append((spec, tuple(literals), regex))
+
+    def parse(self, value, first=None):
+        """Returns the parsed datetime and the index of the matching format.
+
+        The format at index ``first`` is tried before the others. If nothing matches
+        ``(None, None)`` is returned.
+        """
+        if first is not None:
+            result = self._parse_with(value, self.entries[first])
+            if result is not None:
+                return result, first
+        for index, entry in enumerate(self.entries):
+            if index == first:
+                continue
+            result = self._parse_with(value, entry)
+            if result is not None:
+                return result, index
+        return None, None
+
+    def _parse_with(self, value, entry):
+        spec, literals, regex = entry
+        for char in literals:
+            if char not in value:
+                return None
+        if regex is None:
+            try:
+                return datetime.strptime(value, spec)
+            except ValueError:
+                return None
+
+        # Like strptime() this doesn't backtrack to consume the rest of the string.
+        match = regex.match(value)
+        if match is None or match.end() != len(value):
+            return None
+        groups = match.groupdict()
+        if 'Y' in groups:
+            year = int(groups['Y'])
+        elif 'y' in groups:
+            year = int(groups['y'])
+            year += 2000 if year <= 68 else 1900
+        else:
+            year = 1900
+        fraction = groups.get('f')
         try:
-            _date = datetime.strptime(value, spec)
-            if timezone_aware:
-                _date = _date.replace(tzinfo=UTC)
-            return _date
+            return datetime(year, int(groups.get('m', 1)), int(groups.get('d', 1)),
+                            int(groups.get('H', 0)), int(groups.get('M', 0)),
+                            int(groups.get('S', 0)),
+                            int(fraction + '0' * (6 - len(fraction))) if fraction else 0)
         except ValueError:
-            continue
-    raise Invalid(schema, path, 'Please enter a valid date/time.', bad_value=value)
+            return None
+
+_parsers = {}
+
+def _parse(value, formats, schema=None):
+    parser = _parsers.get(id(formats))
+    if parser is None or parser.formats is not formats:
+        parser = _parsers[id(formats)] = _FormatParser(formats)
+    if schema is None or not getattr(schema, 'remember_format', False):
+        return parser.parse(value)[0]
+    result, schema.last_format = parser.parse(value, schema.last_format)
+    return result
+
+def _parse_datetime(value, timezone_aware=True, schema=None):
+    _date = _parse(value, DATETIME_INPUT_FORMATS, schema)
+    if _date is not None and timezone_aware:
+        _date = _date.replace(tzinfo=UTC)
+    return _date
+
+def parse_datetime(schema, value, path, timezone_aware=True):
+    _date = _parse_datetime(value, timezone_aware, schema)
+    if _date is None:
+        raise Invalid(schema, path, 'Please enter a valid date/time.', bad_value=value)
+    return _date
 
 DATE_INPUT_FORMATS = (
     '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y',  # '2006-10-25', '10/25/2006', '10/25/06'
     '%d.%m.%Y', '%d.%m.%y',              # '25.10.2006', '25.10.06'
 )
 
+def _parse_date(value, schema=None):
+    _date = _parse(value, DATE_INPUT_FORMATS, schema)
+    return None if _date is None else _date.date()
+
 def parse_date(schema, value, path):
-    for spec in DATE_INPUT_FORMATS:
-        try:
-            return datetime.strptime(value, spec).date()
-        except ValueError:
-            continue
-    raise Invalid(schema, path, 'Please enter a valid date.', bad_value=value)
+    _date = _parse_date(value, schema)
+    if _date is None:
+        raise Invalid(schema, path, 'Please enter a valid date.', bad_value=value)
+    return _date
 
 TIME_INPUT_FORMATS = (
     '%H:%M:%S',     # '14:30:59'
     '%H:%M',        # '14:30'
 )
 
+def _parse_time(value, schema=None):
+    _time = _parse(value, TIME_INPUT_FORMATS, schema)
+    return None if _time is None else _time.time()
+
 def parse_time(schema, value, path):
-    for spec in TIME_INPUT_FORMATS:
-        try:
-            return datetime.strptime(value, spec).time()
-        except ValueError:
-            continue
-    raise Invalid(schema, path, 'Please enter a valid time.', bad_value=value)
+    _time = _parse_time(value, schema)
+    if _time is None:
+        raise Invalid(schema, path, 'Please enter a valid time.', bad_value=value)
+    return _time
 
 FIELD_TYPES_MAPPING = {
     bool: Bool,
@@ -597,45 +3211,283 @@ FIELD_TYPES_MAPPING = {
     datetime: DateTime,
     float: Float,
     int: Int,
-    str: lambda *args, **kwargs: String(*args, blank=True, **kwargs),
+    str: functools.partial(String, blank=True),
     time: Time,
 }
 
+def intern_schema(schema, table=None):
+    """Returns ``schema`` with structurally identical parts merged into one object.
+
+    Subschemas and validators that have the same class and equal attributes (with
+    their own subschemas and validators merged first) get replaced by the first
+    such object, so e.g. thousands of ``String(blank=True)`` in a generated schema
+    become one. Attributes that aren't plain values, tuples, lists, dicts or sets
+    (e.g. callables) only match themselves. Objects with a ``__getstate__()`` are
+    compared by its result, and the slots a class lists in ``_caches`` are left
+    out, so caches don't count.
+
+    The schema gets modified in place. Interned schemas are shared, so they must
+    not be modified afterwards. To merge the parts of several schemas, e.g. one
+    per tenant, pass the same ``table`` dict to every call. It keeps the merged
+    objects alive.
+    """
+    if table is None:
+        table = {}
+    return _Interner(table).intern(schema)
+
+class _Identity(object):
+    """Makes a value in an interning key compare by identity."""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, _Identity) and other.value is self.value
+
+    def __hash__(self):
+        return id(self.value)
+
+_PLAIN_TYPES = frozenset([str, bytes, int, float, complex, bool, type(None)])
+
+class _Interner(object):
+    def __init__(self, table):
+        self.table = table
+        # id() of the visited objects to (object, result). The objects are kept
+        # alive so the ids don't get reused.
+        self.done = {}
+        self.active = set()
+
+    def intern(self, obj):
+        done = self.done.get(id(obj))
+        if done is not None:
+            return done[1]
+        if id(obj) in self.active:
+            # A recursive schema. Its own key can't contain itself.
+            return obj
+        self.active.add(id(obj))
+        try:
+            key = [type(obj)]
+            for name, value in _intern_state(obj):
+                new = self.replace(value, name == 'validators')
+                if new is not value:
+                    setattr(obj, name, new)
+                key.append((name, self.key(new)))
+        finally:
+            self.active.discard(id(obj))
+        result = self.table.setdefault(tuple(key), obj)
+        self.done[id(obj)] = (obj, result)
+        return result
+
+    def replace(self, value, validators=False):
+        # Returns value with the schemas in it (and the validators) interned.
+        if isinstance(value, Schema):
+            return self.intern(value)
+        if type(value) in (list, tuple):
+            if validators:
+                items = [self.intern(item) for item in value]
+            else:
+                items = [self.replace(item) for item in value]
+            if all(map(operator.is_, items, value)):
+                return value
+            return type(value)(items)
+        if type(value) is dict:
+            items = [(key, self.replace(item)) for key, item in value.items()]
+            if all(item is value[key] for key, item in items):
+                return value
+            return dict(items)
+        return value
+
+    def key(self, value):
+        kind = type(value)
+        if kind in _PLAIN_TYPES:
+            return (kind, value)
+        if kind in (list, tuple):
+            return (kind,) + tuple(map(self.key, value))
+        if kind is dict:
+            return (kind,) + tuple((self.key(key), self.key(item))
+                                   for key, item in value.items())
+        if kind in (set, frozenset):
+            return (kind, frozenset(map(self.key, value)))
+        return _Identity(value)
+
+def _intern_state(obj):
+    # The attributes that make up a schema or validator.
+    getstate = getattr(type(obj), '__getstate__', None)
+    if getstate is not None and getstate is not getattr(object, '__getstate__', None):
+        return list(obj.__getstate__().items())
+    state = []
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        caches = cls.__dict__.get('_caches', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name in ('__dict__', '__weakref__') or name in caches:
+                continue
+            try:
+                # Unset slots (e.g. fields that get built on first use) are left out.
+                state.append((name, cls.__dict__[name].__get__(obj, cls)))
+            except AttributeError:
+                pass
+    state.extend(sorted(getattr(obj, '__dict__', {}).items()))
+    return state
+
+# The number of (kind, ignore_rest, kwargs) combinations whose schemas from_typing()
+# keeps, the least recently used ones get dropped.
+_TYPING_CACHE_SIZE = 512
+
 def from_typing(kind, ignore_rest=False, **kwargs):
+    """Returns a schema for a type annotation.
+
+    The schemas are cached by ``(kind, ignore_rest, kwargs)``, unless a keyword
+    argument can't be hashed. So every type gets built only once, even if it's
+    nested in many others. The returned schema is a deep copy, so it (and every
+    schema in it) can be modified without affecting other callers. The fields of a
+    ``NamedTuple`` get built on first use, which also allows self-referential types
+    via forward references.
+    """
+    return _copy_schema(_shared_from_typing(kind, ignore_rest, **kwargs), {})
+
+def _shared_from_typing(kind, ignore_rest=False, **kwargs):
+    # Returns the cached schema for the annotation, see from_typing().
+    try:
+        options = frozenset(kwargs.items())
+        hash(kind)
+    except TypeError:
+        return _from_typing(kind, ignore_rest, **kwargs)
+    return _cached_from_typing(kind, ignore_rest, options)
+
+@functools.lru_cache(_TYPING_CACHE_SIZE)
+def _cached_from_typing(kind, ignore_rest, options):
+    return _from_typing(kind, ignore_rest, **dict(options))
+
+def _copy_schema(schema, copies):
+    # Returns a deep copy of the schema with its own validators, entries, choices
+    # and caches. copies maps the ids of the schemas copied so far to the original
+    # and its copy, so each one gets copied once and recursive schemas stay
+    # recursive. Unlike copy.deepcopy() this doesn't build fields that get built on
+    # first use, the copy builds (and copies) them on its own.
+    if id(schema) in copies:
+        return copies[id(schema)][1]
+    result = type(schema).__new__(type(schema))
+    copies[id(schema)] = (schema, result)
+    state = _intern_state(schema)
+    for name, value in state:
+        setattr(result, name, _copy_value(value, copies))
+    if isinstance(schema, Dict):
+        result._plans = (None, 0, {})
+    if isinstance(schema, OneOf):
+        result._types = {}
+    if isinstance(schema, (NamedTuple, DataClass)) and 'schema' not in dict(state):
+        result._copies = copies
+    return result
+
+def _copy_value(value, copies):
+    # Copies the schemas in an attribute of a schema, see _copy_schema().
+    if isinstance(value, Schema):
+        return _copy_schema(value, copies)
+    if type(value) in (list, tuple):
+        return type(value)([_copy_value(item, copies) for item in value])
+    if type(value) is dict:
+        return {key: _copy_value(item, copies) for key, item in value.items()}
+    return value
+
+# The origins of the generic aliases (List[int] etc.). Before Python 3.7, they're the
+# typing classes, since then the builtin ones.
+_DICT_ORIGINS = (dict, typing.Dict)
+_LIST_ORIGINS = (list, typing.List)
+_TUPLE_ORIGINS = (tuple, typing.Tuple)
+
+def _is_union(kind):
     if kind.__class__ is typing.Union.__class__:
+        return True
+    origin = getattr(kind, '__origin__', None)
+    # int | None has no __origin__, but is a types.UnionType (Python 3.10+).
+    return origin is typing.Union or type(kind) is getattr(types, 'UnionType', None)
+
+def _from_typing(kind, ignore_rest=False, **kwargs):
+    if _is_union(kind):
         union = set(kind.__args__)
         if type(None) in union:
             kwargs['null'] = True
             union -= {type(None)}
         if len(union) == 1:
-            return from_typing(list(union)[0], ignore_rest, **kwargs)
-        return OneOf([from_typing(f, ignore_rest) for f in union], **kwargs)
-    if issubclass(kind, tuple) and hasattr(kind, '_field_types'):
+            return _shared_from_typing(list(union)[0], ignore_rest, **kwargs)
+        return OneOf([_shared_from_typing(f, ignore_rest) for f in union], index_types=True,
+                     **kwargs)
+    if isinstance(kind, type) and issubclass(kind, tuple) and hasattr(kind, '_fields') and (
+            hasattr(kind, '__annotations__') or hasattr(kind, '_field_types')):
         return NamedTuple(kind, ignore_rest=ignore_rest, **kwargs)
-    if issubclass(kind, typing.Dict):
-        return Dict([from_typing(f, ignore_rest) for f in kind.__args__],
+    if dataclasses is not None and dataclasses.is_dataclass(kind):
+        return DataClass(kind, ignore_rest=ignore_rest, **kwargs)
+    origin = getattr(kind, '__origin__', None)
+    if origin in _DICT_ORIGINS:
+        return Dict([_shared_from_typing(f, ignore_rest) for f in kind.__args__],
                     ignore_rest=ignore_rest)
-    if issubclass(kind, typing.List):
-        return List(from_typing(kind.__args__[0], ignore_rest), **kwargs)
-    if issubclass(kind, typing.Tuple):
+    if origin in _LIST_ORIGINS:
+        return List(_shared_from_typing(kind.__args__[0], ignore_rest), **kwargs)
+    if origin in _TUPLE_ORIGINS:
         # TODO: List and Dict may have to be adjusted for the two modes too!
         kind_args = [f for f in kind.__args__ if f is not Ellipsis]
         if len(kind_args) > 1:
-            return Tuple([from_typing(f, ignore_rest) for f in kind_args],
+            return Tuple([_shared_from_typing(f, ignore_rest) for f in kind_args],
                          **kwargs)
-        return Tuple(from_typing(kind_args[0], ignore_rest), **kwargs)
+        return Tuple(_shared_from_typing(kind_args[0], ignore_rest), **kwargs)
     return FIELD_TYPES_MAPPING[kind](**kwargs)
 
+def _copy_fields(schema, fields):
+    # The fields of a NamedTuple or DataClass that from_typing() returned are copied
+    # along with the rest of its schema, see _copy_schema().
+    copies = getattr(schema, '_copies', None)
+    if copies is None:
+        return fields
+    schema._copies = None
+    return {name: _copy_value(field, copies) for name, field in fields.items()}
+
 class NamedTuple(Dict):
     """Schema for a typing.NamedTuple that contains type annotations."""
+    __slots__ = ('named_tuple', '_copies')
+    _caches = ('_copies',)
 
     def __init__(self, named_tuple, **kwargs):
         self.named_tuple = named_tuple
-        super().__init__({name: from_typing(kind, kwargs.get('ignore_rest', False))
-                          for name, kind in named_tuple._field_types.items()},
-                         **kwargs)
+        super().__init__(**kwargs)
+        # The field schemas get built by __getattr__() on first use.
+        del self.schema
+
+    def __getattr__(self, name):
+        if name != 'schema':
+            raise AttributeError(name)
+        # Forward references can refer to the named tuple itself, even if it's not
+        # defined at module level.
+        named_tuple = self.named_tuple
+        hints = typing.get_type_hints(named_tuple,
+                                      localns={named_tuple.__name__: named_tuple})
+        self.schema = _copy_fields(self, {
+            name: _shared_from_typing(hints[name], self.ignore_rest)
+            for name in named_tuple._fields})
+        return self.schema
 
     def _convert(self, value, path, named_tuple_to_dict=False, **kwargs):
+        memo = kwargs.get('memo')
+        if memo is not None and not kwargs.pop('_memoized', False):
+            if named_tuple_to_dict:
+                kwargs['named_tuple_to_dict'] = True
+            return memo._convert(NamedTuple._convert, self, value, path, kwargs)
+        # Complete records get their fields converted into the tuple directly.
+        if not named_tuple_to_dict:
+            if isinstance(value, self.named_tuple):
+                values = value
+            elif self._has_all_keys(value):
+                values = (value[key] for key in self.schema)
+            else:
+                values = None
+            if values is not None:
+                result = self._convert_record(values, value, path, kwargs)
+                if (not kwargs.get('copy', True) and values is value and
+                        all(map(operator.is_, result, value))):
+                    return value
+                return self.named_tuple._make(result)
+
         orig = value
         if isinstance(value, self.named_tuple):
             value = value._asdict()
@@ -649,6 +3501,324 @@ class NamedTuple(Dict):
             return result_dict
         return self.named_tuple(**result_dict)
 
+    async def _aconvert_value(self, value, path, context):
+        if type(self)._convert is not NamedTuple._convert:
+            return await super()._aconvert_value(value, path, context)
+        orig = value
+        if isinstance(value, self.named_tuple):
+            value = value._asdict()
+        try:
+            result_dict = await self._aconvert_dict(value, path, context)
+        except Invalid as e:
+            e.bad_value = orig
+            raise e
+        if context.kwargs.get('named_tuple_to_dict'):
+            return result_dict
+        return self.named_tuple(**result_dict)
+
+    def _accepts_type(self, kind):
+        if (type(self).convert is not Schema.convert or
+                type(self)._convert is not NamedTuple._convert):
+            return super()._accepts_type(kind)
+        return issubclass(kind, (dict, self.named_tuple))
+
+    def _check_convert(self, value):
+        if type(self)._convert is not NamedTuple._convert:
+            return super()._check_convert(value)
+        if isinstance(value, self.named_tuple):
+            value = value._asdict()
+        result_dict = self._check_dict(value)
+        if result_dict is _INVALID:
+            return _INVALID
+        return self.named_tuple(**result_dict)
+
+    def _compile_convert(self, memo):
+        if type(self)._convert is not NamedTuple._convert:
+            return super()._compile_convert(memo)
+        schema = self
+        named_tuple = self.named_tuple
+        make = named_tuple._make
+        has_all_keys = self._has_all_keys
+        convert_dict = self._compile_dict(memo)
+        fields = tuple((key, field._compile(memo)) for key, field in self.schema.items())
+
+        def convert_value(value, path):
+            if isinstance(value, named_tuple):
+                values = value
+            elif has_all_keys(value):
+                values = [value[key] for key, _ in fields]
+            else:
+                values = None
+            if values is not None:
+                errors = []
+                result = []
+                for (key, convert), subvalue in zip(fields, values):
+                    try:
+                        result.append(convert(subvalue, Path(path, key)))
+                    except Invalid as error:
+                        errors.append(error)
+                if errors:
+                    error = Invalid(schema, path, bad_value=value)
+                    error.add(errors)
+                    raise error
+                return make(result)
+
+            orig = value
+            if isinstance(value, named_tuple):
+                value = value._asdict()
+            try:
+                result_dict = convert_dict(value, path)
+            except Invalid as e:
+                e.bad_value = orig
+                raise e
+            return named_tuple(**result_dict)
+        return convert_value
+
+    def _revalidate_value(self, old, tree, path, kwargs):
+        if type(self)._convert is not NamedTuple._convert or not isinstance(old, self.named_tuple):
+            return super()._revalidate_value(old, tree, path, kwargs)
+        return self.named_tuple(**self._revalidate_dict(old._asdict(), tree, path, kwargs))
+
+    def _dump(self, value, primitive):
+        if isinstance(value, self.named_tuple):
+            return self._dump_fields(zip(self.schema, value), primitive)
+        return super()._dump(value, primitive)
+
     def to_dict(self, value):
+        """Returns the named tuple as a dict, without validating it again.
+
+        Nested records become dicts, too. Unlike with ``dump()`` the other values are
+        kept as they are.
+        """
         assert isinstance(value, self.named_tuple)
-        return self.convert(value, named_tuple_to_dict=True)
+        return self._dump(value, False)
+
+class ProfileEntry(object):
+    """The statistics of one schema node at one path pattern.
+
+    ``path`` is the path with list indices collapsed to ``'*'``. The times are in
+    seconds, ``self_time`` excludes the time spent in the children's ``convert()``.
+    ``defaults`` counts how often ``use_default_for_invalid`` fell back to the default.
+    """
+
+    def __init__(self, schema, path):
+        self.schema = schema
+        self.path = path
+        self.label = f"{type(schema).__name__}({'.'.join(map(str, path))})"
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.failures = 0
+        self.defaults = 0
+
+    def __repr__(self):
+        return (f'<ProfileEntry {self.label} calls={self.calls} '
+                f'total_time={self.total_time:.6f} self_time={self.self_time:.6f} '
+                f'failures={self.failures} defaults={self.defaults}>')
+
+class Profile(object):
+    """The report of ``profile()``.
+
+    ``entries`` maps ``(schema, path pattern)`` to a ``ProfileEntry``, ``str()``
+    renders them as a table and ``collapsed()`` exports the call stacks for
+    flamegraph tools.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.stacks = {}
+        # The frames are lists of [schema, path, entry, child time, defaults, labels],
+        # labels being the labels of the entries on the stack up to this one.
+        self._stack = []
+
+    def top(self, count=None, key='self_time'):
+        """Returns the entries with the highest ``key``, e.g. ``'calls'`` or ``'failures'``."""
+        entries = sorted(self.entries.values(), key=lambda entry: getattr(entry, key),
+                         reverse=True)
+        return entries[:count]
+
+    def collapsed(self):
+        """Returns the stacks in the collapsed format, weighted by microseconds of self time."""
+        return ''.join(f"{';'.join(stack)} {round(self_time * 1e6)}\n"
+                       for stack, self_time in self.stacks.items())
+
+    def __str__(self):
+        lines = [f"{'calls':>9} {'total s':>10} {'self s':>10} {'failures':>9} "
+                 f"{'defaults':>9}  node"]
+        for entry in self.top():
+            lines.append(f'{entry.calls:>9} {entry.total_time:>10.6f} '
+                         f'{entry.self_time:>10.6f} {entry.failures:>9} '
+                         f'{entry.defaults:>9}  {entry.label}')
+        return '\n'.join(lines)
+
+    def _convert(self, convert, schema, value, path, kwargs):
+        stack = self._stack
+        # A convert() that calls super().convert() counts only once.
+        if stack and stack[-1][0] is schema and stack[-1][1] is path:
+            return convert(schema, value, path, **kwargs)
+
+        pattern = tuple('*' if isinstance(key, int) else key
+                        for key in as_path_tuple(path))
+        entry = self.entries.get((id(schema), pattern))
+        if entry is None:
+            entry = self.entries[id(schema), pattern] = ProfileEntry(schema, pattern)
+        labels = (stack[-1][5] if stack else ()) + (entry.label,)
+        frame = [schema, path, entry, 0.0, 0, labels]
+        stack.append(frame)
+        start = perf_counter()
+        try:
+            return convert(schema, value, path, **kwargs)
+        except Invalid:
+            entry.failures += 1
+            raise
+        finally:
+            elapsed = perf_counter() - start
+            entry.calls += 1
+            entry.total_time += elapsed
+            entry.self_time += elapsed - frame[3]
+            entry.defaults += frame[4]
+            self.stacks[labels] = self.stacks.get(labels, 0.0) + elapsed - frame[3]
+            stack.pop()
+            if stack:
+                stack[-1][3] += elapsed
+
+    def _get_default(self, get_default, schema, path):
+        stack = self._stack
+        # Dict also calls get_default() for missing entries, which isn't a fallback.
+        if stack and stack[-1][0] is schema:
+            stack[-1][4] += 1
+        return get_default(schema, path)
+
+_profile = None
+
+def _schema_classes(cls=Schema):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _schema_classes(subclass)
+
+@contextlib.contextmanager
+def profile():
+    """Records statistics about every ``convert()`` call and returns them as a ``Profile``.
+
+    While the block runs, the ``convert()`` and ``get_default()`` methods of all
+    ``Schema`` classes get replaced with instrumented versions, so there's no
+    overhead at all outside of it. Only calls in the current thread are recorded,
+    the other threads just pay for checking which thread they are. Compiled
+    converters and classes defined inside the block aren't instrumented.
+    """
+    global _profile
+    if _profile is not None:
+        raise RuntimeError('Profiling is already enabled.')
+    _profile = report = Profile()
+    get_ident = threading.get_ident
+    thread = get_ident()
+
+    def instrument_convert(convert):
+        @functools.wraps(convert)
+        def wrapper(self, value, path=(), **kwargs):
+            if get_ident() != thread:
+                return convert(self, value, path, **kwargs)
+            return report._convert(convert, self, value, path, kwargs)
+        return wrapper
+
+    def instrument_get_default(get_default):
+        @functools.wraps(get_default)
+        def wrapper(self, path):
+            if get_ident() != thread:
+                return get_default(self, path)
+            return report._get_default(get_default, self, path)
+        return wrapper
+
+    originals = []
+    for cls in set(_schema_classes()):
+        for name, instrument in (('convert', instrument_convert),
+                                 ('get_default', instrument_get_default)):
+            if name in cls.__dict__:
+                originals.append((cls, name, cls.__dict__[name]))
+                setattr(cls, name, instrument(cls.__dict__[name]))
+    try:
+        yield report
+    finally:
+        for cls, name, method in originals:
+            setattr(cls, name, method)
+        _profile = None
+
+def _field_schema(field, kind, ignore_rest):
+    # Schemas with a default aren't cached, so the defaults don't get shared.
+    if field.default_factory is not dataclasses.MISSING:
+        return _from_typing(kind, ignore_rest, default=field.default_factory)
+    if field.default is not dataclasses.MISSING:
+        default = field.default
+        # Callable defaults would get called by get_default(), so they get wrapped
+        # (picklable, unlike a lambda).
+        if callable(default):
+            default = functools.partial(operator.itemgetter(0), (default,))
+        return _from_typing(kind, ignore_rest, default=default)
+    return _shared_from_typing(kind, ignore_rest)
+
+class DataClass(Dict):
+    """Schema for a dataclass that contains type annotations.
+
+    The converted field values are passed to the class positionally, except for
+    keyword-only fields. Fields with ``init=False`` are left out, and the
+    ``default`` or ``default_factory`` of a field becomes the default of its schema.
+    """
+    __slots__ = ('data_class', '_keywords', '_copies')
+    _caches = ('_copies',)
+
+    def __init__(self, data_class, **kwargs):
+        self.data_class = data_class
+        super().__init__(**kwargs)
+        # The field schemas (and which of them are keyword-only) get built by
+        # __getattr__() on first use.
+        del self.schema
+
+    def __getattr__(self, name):
+        if name == '_keywords':
+            self._keywords = tuple(field.name for field in self._init_fields()
+                                   if getattr(field, 'kw_only', False) is True)
+            return self._keywords
+        if name != 'schema':
+            raise AttributeError(name)
+        data_class = self.data_class
+        hints = typing.get_type_hints(data_class,
+                                      localns={data_class.__name__: data_class})
+        self.schema = _copy_fields(self, {
+            field.name: _field_schema(field, hints[field.name], self.ignore_rest)
+            for field in self._init_fields()})
+        return self.schema
+
+    def _init_fields(self):
+        # The fields in the order of __init__(): keyword-only fields (Python 3.10+)
+        # come last.
+        fields = [field for field in dataclasses.fields(self.data_class) if field.init]
+        return sorted(fields, key=lambda field: getattr(field, 'kw_only', False) is True)
+
+    def _convert(self, value, path, **kwargs):
+        memo = kwargs.get('memo')
+        if memo is not None and not kwargs.pop('_memoized', False):
+            return memo._convert(DataClass._convert, self, value, path, kwargs)
+        if isinstance(value, self.data_class):
+            values = (getattr(value, key) for key in self.schema)
+        elif self._has_all_keys(value):
+            values = (value[key] for key in self.schema)
+        else:
+            return self.data_class(**super()._convert(value, path, **kwargs))
+        result = self._convert_record(values, value, path, kwargs)
+        keywords = self._keywords
+        if not keywords:
+            return self.data_class(*result)
+        count = len(result) - len(keywords)
+        return self.data_class(*result[:count], **dict(zip(keywords, result[count:])))
+
+    def _dump(self, value, primitive):
+        if isinstance(value, self.data_class):
+            return self._dump_fields(((key, getattr(value, key)) for key in self.schema),
+                                     primitive)
+        return super()._dump(value, primitive)
+
+    def _accepts_type(self, kind):
+        if (type(self).convert is not Schema.convert or
+                type(self)._convert is not DataClass._convert):
+            return super()._accepts_type(kind)
+        return issubclass(kind, (dict, self.data_class))
@@ -1,6 +1,17 @@
 from . import sd
+import array
+from .benchmarks import (BASELINE_FILE, REFERENCE, baseline, benchmarks, compare,
+                         run as run_benchmarks)
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from datetime import datetime, date, time
+import io
+import struct
+import json
+import pickle
 from typing import NamedTuple, List, Union, Optional
-from unittest import TestCase
+from unittest import TestCase, skipIf
 
 Person = NamedTuple('Person', [
     ('name', str),
@@ -121,3 +132,1147 @@ class SchemaTests(TestCase):
     def test_default_for_invalid(self):
         schema = sd.Dict({'a': sd.Int(default=lambda: 2, use_default_for_invalid=True)})
         self.assertEqual({'a': 2}, schema.convert({'a': 'gaga'}))
+
+def error_tree(schema_convert, value):
+    try:
+        schema_convert(value)
+    except sd.Invalid as e:
+        return {path: [(type(child), child.message) for child in children]
+                for path, children in e.flattened().items()}
+    raise AssertionError('Invalid not raised')
+
+class CompileTests(TestCase):
+    person = sd.Dict({
+        'kind': 'person',
+        'name': sd.String(validators=[sd.MaxLength(20)]),
+        'age': sd.Int(validators=[sd.MinValue(0), sd.MaxValue(lambda: 150)]),
+        'email': sd.Email(optional=True),
+        'role': sd.String(default='user', validators=[sd.In(['user', 'admin'])]),
+        'score': sd.Float(default=0.0, use_default_for_invalid=True),
+    })
+    people = sd.List(person, validators=[sd.MinLength(1)])
+
+    def assert_same(self, schema, value):
+        self.assertEqual(schema.convert(value), schema.compile()(value))
+
+    def assert_same_errors(self, schema, value):
+        self.assertEqual(error_tree(schema.convert, value),
+                         error_tree(schema.compile(), value))
+
+    def test_results(self):
+        person = {'kind': 'person', 'name': ' Al ', 'age': '9', 'score': 'x'}
+        self.assert_same(self.person, person)
+        self.assert_same(self.people, [person, dict(person, role='admin')])
+        self.assert_same(people_schema, {'count': 2, 'people': [{'name': 'A', 'age': 1}]})
+        self.assert_same(SchemaTests.one_of, [1.1, 45.1, 45])
+        self.assert_same(SchemaTests.ordered_tuple, (1.1, 45.1))
+        self.assert_same(sd.Dict((sd.String(), sd.Int())), {'a': '1', 'b': 2})
+        self.assert_same(sd.String(null=True), '  ')
+
+    def test_errors(self):
+        self.assert_same_errors(self.person, {'kind': 'animal', 'name': 'x' * 30,
+                                              'age': -1, 'role': 'root', 'foo': 1})
+        self.assert_same_errors(self.people, [])
+        self.assert_same_errors(self.people, [{'age': 'x'}, 1])
+        self.assert_same_errors(people_schema_strict, {'count': 'a', 'people': [{}]})
+        self.assert_same_errors(SchemaTests.ordered_tuple, (1,))
+        self.assert_same_errors(SchemaTests.one_of, {'name': None})
+
+class PathTests(TestCase):
+    def test_path(self):
+        path = sd.Path(sd.Path(('root',), 'people'), 3)
+        self.assertEqual(path.as_tuple(), ('root', 'people', 3))
+        self.assertEqual(path, ('root', 'people', 3))
+        self.assertEqual(hash(path), hash(('root', 'people', 3)))
+        self.assertEqual(path + ('age',), ('root', 'people', 3, 'age'))
+        self.assertEqual(len(path), 3)
+        self.assertEqual(path[-1], 3)
+
+    def test_error_paths(self):
+        schema = sd.Dict({'people': sd.List(sd.Dict({'age': sd.Int()}))})
+        value = {'people': [{'age': 1}, {'age': 'x'}, {}]}
+        for convert in (schema.convert, schema.compile()):
+            with self.assertRaises(sd.Invalid) as cm:
+                convert(value, ('root',))
+            self.assertEqual(set(cm.exception.children),
+                             {('root', 'people', 1, 'age'), ('root', 'people', 2, 'age')})
+            self.assertTrue(all(type(path) is tuple for path in cm.exception.children))
+            self.assertEqual(set(cm.exception.flattened()),
+                             {'root.people.1.age', 'root.people.2.age'})
+
+class FailFastTests(TestCase):
+    schema = sd.List(sd.Dict({
+        'a': sd.Int(validators=[sd.MinValue(2), sd.In([2, 3])]),
+        'b': sd.Int(),
+    }))
+
+    def test_fail_fast(self):
+        value = [{'a': 1, 'b': 'x'}, {'a': 'y'}]
+        tree = error_tree(self.schema.convert, value)
+        self.assertEqual(len(tree), 4)
+        self.assertEqual(len(tree['0.a']), 2)
+        with self.assertRaises(sd.Invalid) as cm:
+            self.schema.convert(value, fail_fast=True)
+        self.assertEqual(list(cm.exception.flattened()), ['0.a'])
+        self.assertEqual(len(cm.exception.children[(0, 'a')]), 1)
+
+    def test_key_value_dict_collects_all_errors(self):
+        schema = sd.Dict((sd.Int(), sd.Int()))
+        self.assertEqual(schema.convert({'1': '2'}), {1: 2})
+        self.assertEqual(set(error_tree(schema.convert, {'a': 1, 2: 'b'})), {'a', '2'})
+        self.assertEqual(set(error_tree(schema.compile(), {'a': 1, 2: 'b'})), {'a', '2'})
+        self.assertEqual(len(error_tree(lambda v: schema.convert(v, fail_fast=True),
+                                        {'a': 1, 2: 'b'})), 1)
+
+    def test_is_valid(self):
+        self.assertTrue(self.schema.is_valid([{'a': 2, 'b': '3'}]))
+        self.assertFalse(self.schema.is_valid([{'a': 2, 'b': 'x'}]))
+        self.assertFalse(self.schema.is_valid([{'a': 2, 'b': 1, 'c': 1}]))
+        self.assertFalse(self.schema.is_valid([{'a': 2}]))
+        self.assertFalse(self.schema.is_valid('abc'))
+        self.assertTrue(people_schema.is_valid({'count': 1, 'people': [{'name': 'A', 'age': 1}]}))
+        self.assertFalse(people_schema.is_valid({'count': 1, 'people': [{'name': 'A'}]}))
+        self.assertTrue(SchemaTests.one_of.is_valid([1, 2]))
+        self.assertFalse(SchemaTests.one_of.is_valid({'name': 'A'}))
+        self.assertTrue(sd.Email().is_valid('Foo@Example.com'))
+        self.assertFalse(sd.Email().is_valid('foo.example.com'))
+        self.assertTrue(sd.DateTime().is_valid('25.10.2006 14:30'))
+        self.assertFalse(sd.Date().is_valid('2006-13-01'))
+        self.assertTrue(sd.Int(default=1, use_default_for_invalid=True).is_valid('x'))
+        self.assertTrue(sd.String(blank=True).is_valid(''))
+        self.assertFalse(sd.String().is_valid('  '))
+
+    def test_is_valid_builds_no_errors(self):
+        created = []
+        orig_init = sd.Invalid.__init__
+
+        def init(self, *args, **kwargs):
+            created.append(self)
+            orig_init(self, *args, **kwargs)
+        sd.Invalid.__init__ = init
+        try:
+            self.assertFalse(self.schema.is_valid([{'a': 5, 'b': 1}]))
+            self.assertFalse(people_schema_strict.is_valid({'count': 'x', 'people': []}))
+        finally:
+            sd.Invalid.__init__ = orig_init
+        self.assertEqual(created, [])
+
+class ColumnarTests(TestCase):
+    schema = sd.Dict({
+        'id': sd.Int(validators=[sd.MinValue(0)]),
+        'price': sd.Float(validators=[sd.MaxValue(100)]),
+        'active': sd.Bool(),
+        'day': sd.Date(),
+        'note': sd.String(optional=True),
+    })
+    records = [
+        {'id': 1, 'price': 2, 'active': True, 'day': '2006-10-25'},
+        {'id': '2', 'price': 3.5, 'active': 'false', 'day': '2006-10-25', 'note': ' x '},
+        {'id': 3, 'price': 4.5, 'active': False, 'day': '10/26/2006'},
+    ]
+
+    def convert_rows(self, records):
+        return {key: [self.schema.convert(r).get(key) for r in records]
+                for key in self.schema.schema}
+
+    def test_columns(self):
+        self.assertEqual(self.schema.convert_many(self.records),
+                         self.convert_rows(self.records))
+        numpy = sd.numpy
+        sd.numpy = None
+        try:
+            self.assertEqual(self.schema.convert_many(self.records),
+                             self.convert_rows(self.records))
+        finally:
+            sd.numpy = numpy
+
+    def test_errors(self):
+        records = self.records + [
+            {'id': -1, 'price': 200.0, 'active': True, 'day': 'x'},
+            {'id': 1, 'price': 1.0, 'active': True, 'day': '2006-10-25', 'extra': 1},
+            None,
+        ]
+        self.assertEqual(error_tree(self.schema.convert_many, records),
+                         error_tree(sd.List(self.schema).convert, records))
+        with self.assertRaises(sd.Invalid) as cm:
+            self.schema.convert_many(records, fail_fast=True)
+        self.assertEqual(len(cm.exception.flattened()), 1)
+
+    @skipIf(sd.numpy is None, 'NumPy is not installed')
+    def test_arrays(self):
+        columns = self.schema.convert_many(self.records, as_arrays=True)
+        self.assertEqual(columns['id'].tolist(), [1, 2, 3])
+        self.assertEqual(columns['price'].dtype, sd.numpy.float64)
+        self.assertEqual(columns['note'], [None, 'x', None])
+
+class IterConvertTests(TestCase):
+    def test_iter_convert(self):
+        schema = sd.List(sd.Int())
+        source = (str(i) for i in range(5))
+        converted = schema.iter_convert(source)
+        self.assertEqual(next(converted), 0)
+        self.assertEqual(list(converted), [1, 2, 3, 4])
+        with self.assertRaises(sd.Invalid) as cm:
+            list(schema.iter_convert(iter(['1', 'x', 'y'])))
+        self.assertEqual(list(cm.exception.flattened()), ['1'])
+
+    def test_collect_errors(self):
+        results = list(sd.List(sd.Int()).iter_convert(['1', 'x', '3'], collect_errors=True))
+        self.assertEqual(results[0::2], [1, 3])
+        self.assertIsInstance(results[1], sd.Invalid)
+        self.assertEqual(list(results[1].children), [(1,)])
+
+    def test_ordered(self):
+        schema = sd.Tuple((sd.Int(), sd.Bool()))
+        self.assertEqual(list(schema.iter_convert(['1', 0])), [1, False])
+        self.assertRaises(sd.Invalid, lambda: list(schema.iter_convert(['1'])))
+        self.assertRaises(sd.Invalid, lambda: list(schema.iter_convert(['1', 0, 2])))
+        partial = sd.Tuple((sd.Int(),), ignore_rest=True)
+        self.assertEqual(list(partial.iter_convert(iter(['1', 'x']))), [1])
+
+class DateParsingTests(TestCase):
+    def strptime(self, value, formats):
+        for spec in formats:
+            try:
+                return datetime.strptime(value, spec)
+            except ValueError:
+                continue
+
+    def test_formats(self):
+        moment = datetime(2006, 10, 5, 14, 3, 9, 120000)
+        for formats in (sd.DATETIME_INPUT_FORMATS, sd.DATE_INPUT_FORMATS,
+                        sd.TIME_INPUT_FORMATS):
+            for spec in formats:
+                for value in (moment.strftime(spec), moment.strftime(spec).lower(),
+                              moment.strftime(spec).replace('0', '', 1), spec):
+                    self.assertEqual(sd._parse(value, formats),
+                                     self.strptime(value, formats), value)
+
+    def test_schemas(self):
+        self.assertEqual(sd.DateTime(timezone_aware=False).convert('25.10.2006 14:30'),
+                         datetime(2006, 10, 25, 14, 30))
+        self.assertEqual(sd.Date().convert('25.10.06'), date(2006, 10, 25))
+        self.assertEqual(sd.Time().convert('14:30'), time(14, 30))
+        self.assertRaises(sd.Invalid, lambda: sd.Date().convert('2006-02-30'))
+
+    def test_remember_format(self):
+        schema = sd.DateTime(timezone_aware=False, remember_format=True)
+        self.assertEqual(schema.convert('10/25/06 14:30'), datetime(2006, 10, 25, 14, 30))
+        self.assertEqual(schema.last_format,
+                         sd.DATETIME_INPUT_FORMATS.index('%m/%d/%y %H:%M'))
+        self.assertEqual(schema.convert('10/26/06 14:30'), datetime(2006, 10, 26, 14, 30))
+        self.assertEqual(schema.convert('2006-10-25T14:30:59'),
+                         datetime(2006, 10, 25, 14, 30, 59))
+        self.assertEqual(schema.last_format, 2)
+
+class EmailCacheTests(TestCase):
+    def test_idn(self):
+        self.assertEqual(sd.Email().convert('User@Bücher.de'), 'user@bücher.de')
+        self.assertFalse(sd.Email().is_valid('user@'))
+        for value in ('a@b..c', 'a@' + 'x' * 64 + '.de'):
+            self.assertEqual(error_tree(sd.Email().convert, value),
+                             {'': [(sd.EmailValidatorError, 'Enter a valid e-mail address.')]})
+            self.assertFalse(sd.Email(cache_size=10).is_valid(value))
+
+    def test_cache(self):
+        schema = sd.Email(cache_size=10)
+        validator = schema.get_validators(sd.EmailValidator)[0]
+        self.assertIsNot(validator, sd.Email.default_validators[1])
+        for value in ('a@Example.com', 'A@example.COM', 'a@bücher.de', 'b@bücher.de'):
+            schema.convert(value)
+        self.assertRaises(sd.Invalid, lambda: schema.convert('a@example'))
+        self.assertRaises(sd.Invalid, lambda: schema.convert('a@example'))
+        info = validator.cache_info()
+        self.assertEqual((info['addresses'].hits, info['addresses'].misses), (2, 4))
+        self.assertEqual((info['domains'].hits, info['domains'].misses), (1, 2))
+        validator.cache_clear()
+        self.assertEqual(validator.cache_info()['addresses'].currsize, 0)
+        self.assertEqual(sd.EmailValidator().cache_info(),
+                         {'addresses': None, 'domains': None})
+
+class Counter(object):
+    def __init__(self):
+        self.count = 0
+
+    def check(self, value, path):
+        self.count += 1
+
+class DiscriminatorTests(TestCase):
+    def make_choices(self, counter):
+        return [sd.Dict({'type': 'type%d' % i, 'value': sd.Int(validators=[counter])})
+                for i in range(40)] + [sd.Dict({'value': sd.String()}, ignore_rest=True)]
+
+    def test_discriminator(self):
+        counter = Counter()
+        schema = sd.OneOf(self.make_choices(counter), discriminator='type')
+        plain = sd.OneOf(self.make_choices(Counter()))
+        for value in ({'type': 'type39', 'value': '1'}, {'type': 'other', 'value': 1},
+                      {'value': 2}, {'type': ['unhashable'], 'value': 3}):
+            self.assertEqual(schema.convert(value), plain.convert(value))
+            self.assertEqual(schema.compile()(value), plain.convert(value))
+            self.assertEqual(schema.is_valid(value), True)
+        # Only the type39 choice was tried, once each by convert, compile and is_valid.
+        self.assertEqual(counter.count, 3)
+        self.assertRaises(sd.Invalid, lambda: schema.convert({'type': 'type3', 'value': None}))
+        self.assertRaises(sd.Invalid, lambda: schema.convert([1]))
+
+    def test_type_index(self):
+        union = sd.from_typing(Union[Person, List[int], datetime, int])
+        self.assertTrue(union.index_types)
+        self.assertEqual(union.convert({'name': 'A', 'age': '3'}), Person(name='A', age=3))
+        self.assertEqual(union.convert(['1']), [1])
+        self.assertEqual(union.convert('2'), 2)
+        self.assertIsInstance(union.convert('2006-10-25 14:30'), datetime)
+        kinds = {type(union.choice[p]) for p in union._candidates([])}
+        self.assertEqual(kinds, {sd.List, sd.Int})
+        kinds = {type(union.choice[p]) for p in union._candidates(1)}
+        self.assertEqual(kinds, {sd.Int})
+
+class MessageTests(TestCase):
+    def test_lazy_messages(self):
+        schema = sd.Dict({'a': sd.Int(validators=[sd.In([1, 2])]), 'b': sd.Int()})
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert({'a': 3, 'c': 1})
+        error = cm.exception.children[('a',)][0]
+        self.assertIsNone(error._message)
+        self.assertEqual(error.template, 'This value must be one of: {choices!l}')
+        self.assertEqual(error.message, 'This value must be one of: 1, 2')
+        self.assertEqual(cm.exception.children[('b',)][0].message, "The 'b' entry is missing.")
+        self.assertEqual(cm.exception.children[()][0].message, 'Unconverted values: c')
+        self.assertIn("a: This value must be one of: 1, 2", str(cm.exception))
+
+        error.message = 'Custom'
+        self.assertEqual((error.message, error.params), ('Custom', None))
+        self.assertEqual(sd.Invalid(None, (), 'Braces {} kept').message, 'Braces {} kept')
+
+    def test_as_dicts(self):
+        schema = sd.Dict({'a': sd.Int(validators=[sd.MaxValue(5)]),
+                          'b': sd.List(sd.Int(), validators=[sd.MaxLength(1)])})
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert({'a': '9', 'b': [1, 2]})
+        self.assertEqual(json.loads(json.dumps(cm.exception.as_dicts())), [
+            {'path': ['a'], 'code': 'MaxValueError',
+             'message': 'This value must be smaller than 5.', 'params': {'max_value': 5}},
+            {'path': ['b'], 'code': 'MaxLengthError',
+             'message': 'Ensure this value has at most 1 entries (it has 2).',
+             'params': {'max_length': 1, 'length': 2}},
+        ])
+
+class ParallelTests(TestCase):
+    def test_list(self):
+        schema = sd.List(sd.Int(validators=[sd.MinValue(0)]))
+        value = list(range(50)) + ['x', -1] + list(range(10))
+        self.assertEqual(schema.convert_parallel(value[:50], workers=2, chunk_size=7),
+                         list(range(50)))
+        self.assertEqual(error_tree(lambda v: schema.convert_parallel(v, workers=3,
+                                                                      chunk_size=8), value),
+                         error_tree(schema.convert, value))
+        with self.assertRaises(TypeError):
+            sd.Tuple((sd.Int(), sd.Int())).convert_parallel((1, 2))
+
+    def test_key_value_dict(self):
+        # The lambda default can't be pickled, forked workers inherit the schema.
+        schema = sd.Dict((sd.String(), sd.Int(default=lambda: 0)))
+        value = {str(index): index for index in range(20)}
+        self.assertEqual(schema.convert_parallel(value, workers=2, chunk_size=3), value)
+        value['x'] = 'y'
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert_parallel(value, ('root',), workers=2, chunk_size=3)
+        self.assertEqual(list(cm.exception.children), [('root', 'x')])
+
+    def test_pickling(self):
+        email = sd.Email(cache_size=10)
+        email.convert('a@b.de')
+        copy = pickle.loads(pickle.dumps(email))
+        self.assertEqual(copy.convert('A@b.de'), 'a@b.de')
+        self.assertEqual(copy.validators[-1].cache_info()['addresses'].currsize, 1)
+        self.assertTrue(pickle.loads(pickle.dumps(sd.from_typing(str))).blank)
+        self.assertEqual(pickle.loads(pickle.dumps(sd.Blob())).convert('x'), b'x')
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+class Unique(object):
+    def __init__(self, taken):
+        self.taken = taken
+        self.running = self.max_running = 0
+
+    async def check(self, value, path):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.001)
+        self.running -= 1
+        if value in self.taken:
+            raise sd.Invalid(self, path, '{value!r} is taken.', params={'value': value})
+
+class AsyncTests(TestCase):
+    def test_async_validators(self):
+        unique = Unique({'bob'})
+        schema = sd.List(sd.Dict({'name': sd.String(validators=[unique]), 'age': sd.Int()}))
+        value = [{'name': ' ann ', 'age': '3'}, {'name': 'bob', 'age': 'x'},
+                 {'name': 'bob', 'age': 4}]
+        with self.assertRaises(sd.Invalid) as cm:
+            run(schema.aconvert(value))
+        self.assertEqual(cm.exception.flattened().keys(), {'1.name', '1.age', '2.name'})
+        self.assertEqual(unique.max_running, 3)
+        self.assertEqual(run(schema.aconvert(value[:1])), [{'name': 'ann', 'age': 3}])
+        with self.assertRaises(TypeError):
+            schema.convert(value)
+        with self.assertRaises(TypeError):
+            schema.compile()
+
+    def test_sync_validator_return_value_is_ignored(self):
+        class Truthy(object):
+            def check(self, value, path):
+                return True
+
+        schema = sd.Int(validators=[Truthy()])
+        self.assertEqual(schema.convert('1'), 1)
+        self.assertTrue(schema.is_valid('1'))
+        schema = sd.Dict({'a': sd.Int()}, validators=[Truthy()])
+        self.assertEqual(schema.revalidate({'a': 1}, [(('a',), '2')]), {'a': 2})
+
+    def test_key_value_dict_and_one_of(self):
+        schema = sd.Dict((sd.String(validators=[Unique({'bob'})]), sd.Int()))
+        self.assertEqual(run(schema.aconvert({'ann': '1'})), {'ann': 1})
+        self.assertEqual(error_tree(lambda v: run(schema.aconvert(v)), {'bob': 1, 'x': 'y'}),
+                         {'bob': [(sd.Invalid, "'bob' is taken.")],
+                          'x': [(sd.Invalid, 'This value must be an integer.')]})
+        schema = sd.OneOf([sd.Int(), sd.String(validators=[Unique({'bob'})])])
+        self.assertEqual(run(schema.aconvert('ann')), 'ann')
+        with self.assertRaises(sd.Invalid):
+            run(schema.aconvert('bob'))
+
+    def test_yield_every(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def convert():
+            task = asyncio.ensure_future(ticker())
+            result = await sd.List(sd.Int()).aconvert(list(range(1000)), yield_every=100)
+            task.cancel()
+            return result
+
+        self.assertEqual(run(convert()), list(range(1000)))
+        self.assertGreaterEqual(len(ticks), 10)
+
+class BenchmarkTests(TestCase):
+    def test_benchmarks_run(self):
+        # The benchmarks raise if a valid input fails or an invalid one doesn't.
+        available = benchmarks()
+        for benchmark in available.values():
+            benchmark()
+        with open(BASELINE_FILE) as file:
+            self.assertEqual(set(json.load(file)), set(available))
+
+    def test_compare(self):
+        old = {'a': {'relative': 0.1, 'peak_bytes': 10000},
+               'b': {'relative': 0.1, 'peak_bytes': 10000}}
+        results = {'a': {'relative': 0.085, 'peak_bytes': 11000},
+                   'b': {'relative': 0.07, 'peak_bytes': 20000},
+                   'c': {'relative': 1, 'peak_bytes': 1}}
+        self.assertEqual(compare(results, old), [
+            'b: 0.0700 of the reference, baseline 0.1000',
+            'b: 20000 bytes peak, baseline 10000',
+        ])
+
+    def test_relative(self):
+        results = run_benchmarks(['list_10'], min_time=0.001, repeat=1)
+        self.assertEqual(set(results), {REFERENCE, 'list_10'})
+        self.assertEqual(results[REFERENCE]['relative'], 1)
+        self.assertEqual(results['list_10']['relative'],
+                         results['list_10']['ops_per_sec'] / results[REFERENCE]['ops_per_sec'])
+        self.assertEqual(set(baseline(results)['list_10']), {'relative', 'peak_bytes'})
+
+class ProfileTests(TestCase):
+    def test_entries(self):
+        schema = sd.List(sd.Dict({
+            'n': sd.Int(use_default_for_invalid=True, default=0),
+            'x': sd.OneOf([sd.Int(), sd.String()]),
+            'd': sd.Int(default=1),
+        }))
+        convert = sd.Schema.convert
+        with sd.profile() as report:
+            schema.convert([{'n': 'x', 'x': 'a'}, {'n': 1, 'x': 2}])
+            with self.assertRaises(sd.Invalid):
+                schema.convert([{'x': None}])
+        self.assertIs(sd.Schema.convert, convert)
+
+        entries = {(type(entry.schema).__name__, entry.path): entry
+                   for entry in report.entries.values()}
+        self.assertEqual(entries['List', ()].calls, 2)
+        self.assertEqual(entries['List', ()].failures, 1)
+        self.assertEqual(entries['Dict', ('*',)].calls, 3)
+        # The missing 'd' entry uses its default, but that's not a fallback.
+        self.assertEqual([entries['Int', ('*', 'n')].calls,
+                          entries['Int', ('*', 'n')].defaults], [2, 1])
+        self.assertEqual(entries['Int', ('*', 'x')].failures, 1)
+        self.assertEqual(entries['String', ('*', 'x')].calls, 1)
+        self.assertEqual(entries['OneOf', ('*', 'x')].failures, 1)
+        for entry in report.entries.values():
+            self.assertLessEqual(entry.self_time, entry.total_time)
+
+    def test_collapsed(self):
+        schema = sd.Dict({'a': sd.List(sd.Int())})
+        with sd.profile() as report:
+            schema.convert({'a': [1, 2]})
+        stacks = [line.rsplit(' ', 1)[0] for line in report.collapsed().splitlines()]
+        self.assertEqual(sorted(stacks), ['Dict()', 'Dict();List(a)', 'Dict();List(a);Int(a.*)'])
+        self.assertIn('Int(a.*)', str(report))
+
+    def test_other_threads(self):
+        schema = sd.List(sd.Int())
+        with sd.profile() as report:
+            with ThreadPoolExecutor(1) as executor:
+                self.assertEqual(executor.submit(schema.convert, ['1']).result(), [1])
+            schema.convert([2])
+        self.assertEqual({entry.label: entry.calls for entry in report.entries.values()},
+                         {'List()': 1, 'Int(*)': 1})
+
+Node = NamedTuple('Node', [
+    ('value', int),
+    ('children', List['Node']),
+])
+
+class FromTypingTests(TestCase):
+    def test_cached(self):
+        self.assertIs(sd._shared_from_typing(People, ignore_rest=True),
+                      sd._shared_from_typing(People, ignore_rest=True))
+        self.assertIs(sd._shared_from_typing(List[Person]).schema,
+                      sd._shared_from_typing(People).schema['people'].schema)
+        self.assertEqual(sd._cached_from_typing.cache_info().maxsize, sd._TYPING_CACHE_SIZE)
+        # Unhashable arguments skip the cache.
+        self.assertIsNot(sd.from_typing(int, validators=[]), sd.from_typing(int, validators=[]))
+
+    def test_copies(self):
+        schema = sd.from_typing(People, ignore_rest=True)
+        self.assertIsNot(schema, people_schema)
+        self.assertIsNot(schema.schema['people'], people_schema.schema['people'])
+        self.assertIsNot(schema.schema['people'].schema, people_schema.schema['people'].schema)
+
+        schema = sd.from_typing(List[Person])
+        schema.validators.append(sd.MinLength(1))
+        schema.schema.validators.append(sd.MinLength(1))
+        schema.schema.schema['age'].validators.append(sd.MinValue(1))
+        fresh = sd.from_typing(List[Person])
+        self.assertEqual(fresh.validators, [])
+        self.assertEqual(fresh.schema.validators, [])
+        self.assertEqual(fresh.schema.schema['age'].validators, [])
+        schema = sd.from_typing(People)
+        schema.schema['count'] = sd.String()
+        schema.schema['people'].schema.schema['name'] = sd.Int()
+        self.assertIsInstance(sd.from_typing(People).schema['count'], sd.Int)
+        self.assertIsInstance(sd.from_typing(People).schema['people'].schema.schema['name'],
+                              sd.String)
+
+    def test_lazy_fields(self):
+        Point = NamedTuple('Point', [('x', int), ('y', int)])
+        schema = sd.from_typing(Point)
+        # Reading the slot directly doesn't fall back to __getattr__().
+        self.assertRaises(AttributeError, sd.NestedSchema.schema.__get__, schema)
+        self.assertEqual(schema.convert({'x': '1', 'y': 2}), Point(1, 2))
+        self.assertEqual(set(schema.schema), {'x', 'y'})
+
+    def test_forward_references(self):
+        schema = sd.from_typing(Node)
+        children = schema.schema['children']
+        self.assertIs(children.schema.schema['children'], children)
+        value = {'value': 1, 'children': [{'value': '2', 'children': []}]}
+        self.assertEqual(schema.convert(value), Node(1, [Node(2, [])]))
+
+        Local = NamedTuple('Local', [('next', Optional['Local'])])
+        self.assertEqual(sd.from_typing(Local).convert({'next': {'next': None}}),
+                         Local(Local(None)))
+
+class RecordTests(TestCase):
+    def test_named_tuple(self):
+        schema = sd.from_typing(People)
+        value = {'count': '1', 'people': [{'name': 'a', 'age': '3'}]}
+        expected = People(1, [Person('a', 3)])
+        self.assertEqual(schema.convert(value), expected)
+        self.assertEqual(schema.convert(expected), expected)
+        self.assertEqual(schema.compile()(value), expected)
+        self.assertEqual(schema.to_dict(expected), {'count': 1, 'people': [{'name': 'a', 'age': 3}]})
+
+        invalid = People('x', [Person('a', 'y')])
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert(invalid)
+        self.assertIs(cm.exception.bad_value, invalid)
+        self.assertEqual(set(cm.exception.children), {('count',), ('people', 0, 'age')})
+        for convert in (schema.convert, schema.compile()):
+            self.assertEqual(error_tree(convert, {'count': 'x', 'people': []}),
+                             {'count': [(sd.Invalid, 'This value must be an integer.')]})
+            self.assertEqual(error_tree(convert, {'count': 1, 'people': [], 'x': 1}),
+                             {'': [(sd.UnconvertedValues, 'Unconverted values: x')]})
+
+    @skipIf(sd.dataclasses is None, 'needs dataclasses')
+    def test_data_class(self):
+        @sd.dataclasses.dataclass
+        class Point:
+            x: int
+            y: float
+            tag: str = sd.dataclasses.field(default='', init=False)
+
+        schema = sd.from_typing(Point)
+        self.assertIsInstance(schema, sd.DataClass)
+        self.assertEqual(schema.convert({'x': '1', 'y': '2.5'}), Point(1, 2.5))
+        self.assertEqual(schema.convert(Point('3', 4)), Point(3, 4.0))
+        self.assertEqual(error_tree(schema.convert, {'x': 1}),
+                         {'y': [(sd.MissingEntry, "The 'y' entry is missing.")]})
+
+    @skipIf(sd.dataclasses is None, 'needs dataclasses')
+    def test_data_class_defaults(self):
+        ids = iter(range(10))
+
+        @sd.dataclasses.dataclass
+        class Options:
+            level: int
+            depth: int = 5
+            id: int = sd.dataclasses.field(default_factory=ids.__next__)
+
+        schema = sd.from_typing(Options)
+        self.assertEqual(schema.convert({'level': '1'}), Options(1, 5, 0))
+        self.assertEqual(schema.convert({'level': '1'}), Options(1, 5, 1))
+        self.assertEqual(schema.convert({'level': 1, 'depth': '2', 'id': '7'}),
+                         Options(1, 2, 7))
+        self.assertFalse(sd.from_typing(int).has_default())
+
+    @skipIf(sd.dataclasses is None or
+            'kw_only' not in sd.inspect.signature(sd.dataclasses.dataclass).parameters,
+            'needs dataclasses with kw_only')
+    def test_keyword_only_data_class(self):
+        Point = sd.dataclasses.make_dataclass('Point', [('x', int), ('y', int)],
+                                              kw_only=True)
+        self.assertEqual(sd.from_typing(Point).convert({'x': '1', 'y': 2}), Point(x=1, y=2))
+
+        # Keyword-only fields come after the others in __init__().
+        Line = sd.dataclasses.make_dataclass('Line', [
+            ('start', int, sd.dataclasses.field(kw_only=True)),
+            ('points', List[int]),
+        ])
+        schema = sd.from_typing(Line)
+        self.assertEqual(list(schema.schema), ['points', 'start'])
+        self.assertEqual(schema.convert({'start': '1', 'points': ['2']}),
+                         Line([2], start=1))
+        self.assertEqual(schema.convert(Line(['3'], start='4')), Line([3], start=4))
+
+class DumpTests(TestCase):
+    def test_dump(self):
+        Event = NamedTuple('Event', [('when', datetime), ('tags', List[str]),
+                                     ('people', List[Person])])
+        schema = sd.from_typing(Event)
+        event = Event(datetime(2006, 10, 25, 14, 30), ['a'], [Person('x', 1)])
+        expected = {'when': '2006-10-25T14:30:00', 'tags': ['a'],
+                    'people': [{'name': 'x', 'age': 1}]}
+        self.assertEqual(schema.dump(event), expected)
+        self.assertEqual(json.loads(schema.dump(event, as_json=True)), expected)
+        self.assertEqual(schema.to_dict(event), dict(expected, when=event.when))
+
+        schema = sd.Dict({'s': sd.Set(sd.Date()), 't': sd.Tuple((sd.Int(), sd.Time())),
+                          'o': sd.OneOf([sd.Int(), sd.from_typing(Person)]),
+                          'kind': 'x'})
+        self.assertEqual(schema.dump({'s': {date(2000, 1, 2)}, 't': (1, time(3, 4)),
+                                      'o': Person('y', 2), 'kind': 'x'}),
+                         {'s': ['2000-01-02'], 't': [1, '03:04:00'],
+                          'o': {'name': 'y', 'age': 2}, 'kind': 'x'})
+
+    def test_one_of_choice(self):
+        when = datetime(2006, 10, 25, 14, 30)
+        for discriminator in (None, 'type'):
+            schema = sd.OneOf([sd.Dict({'type': 'a', 'x': sd.Int()}),
+                               sd.Dict({'type': 'b', 'y': sd.DateTime()})],
+                              discriminator=discriminator)
+            self.assertEqual(json.loads(schema.dump({'type': 'b', 'y': when}, as_json=True)),
+                             {'type': 'b', 'y': '2006-10-25T14:30:00'})
+            with self.assertRaises(sd.Invalid):
+                schema.dump({'type': 'c', 'z': 1})
+        schema = sd.OneOf([sd.List(sd.Int()), sd.from_typing(Person)])
+        self.assertEqual(schema.dump(Person('x', 1)), {'name': 'x', 'age': 1})
+        self.assertEqual(schema.dump((1, 2)), [1, 2])
+
+    def test_no_validation(self):
+        counter = Counter()
+        schema = sd.List(sd.Int(validators=[counter]))
+        self.assertEqual(schema.dump((1, 2)), [1, 2])
+        self.assertEqual(counter.count, 0)
+
+class CopyTests(TestCase):
+    def test_passthrough(self):
+        schema = sd.Dict({'a': sd.List(sd.Int()), 'b': sd.Dict((sd.String(), sd.Float())),
+                          'c': sd.from_typing(Person), 'd': sd.Set(sd.Int())})
+        value = {'a': [1, 2], 'b': {'x': 1.5}, 'c': Person('p', 1), 'd': {1}}
+        self.assertIs(schema.convert(value, copy=False), value)
+        result = schema.convert(value)
+        self.assertEqual(result, value)
+        self.assertIsNot(result, value)
+        self.assertIsNot(result['a'], value['a'])
+
+    def test_copies_changed_paths(self):
+        schema = sd.Dict({'a': sd.List(sd.Int()), 'b': sd.List(sd.Int()),
+                          'c': sd.Int(default=3)})
+        value = {'a': [1, 2], 'b': [1, '2'], 'c': 3}
+        result = schema.convert(value, copy=False)
+        self.assertEqual(result, {'a': [1, 2], 'b': [1, 2], 'c': 3})
+        self.assertIsNot(result, value)
+        self.assertIs(result['a'], value['a'])
+        self.assertIsNot(result['b'], value['b'])
+        # Defaults change the dict, too.
+        value = {'a': [], 'b': []}
+        self.assertEqual(schema.convert(value, copy=False), {'a': [], 'b': [], 'c': 3})
+        self.assertEqual(value, {'a': [], 'b': []})
+        self.assertEqual(sd.List(sd.Int()).convert((1, 2), copy=False), [1, 2])
+
+class RevalidateTests(TestCase):
+    def setUp(self):
+        self.schema = sd.Dict({
+            'name': sd.String(),
+            'count': sd.Int(default=0),
+            'tags': sd.List(sd.String(), validators=[sd.MaxLength(2)]),
+            'items': sd.Dict((sd.String(), sd.from_typing(Person))),
+        })
+        self.counter = Counter()
+        self.schema.schema['name'].validators.append(self.counter)
+        self.value = self.schema.convert({'name': 'a', 'count': '1', 'tags': ['x'],
+                                          'items': {'p': {'name': 'p', 'age': 1}}})
+        self.counter.count = 0
+
+    def test_patches(self):
+        old = self.value
+        result = self.schema.revalidate(old, [
+            (('count',), '5'),
+            (('tags', 1), 'y'),
+            (('items', 'p', 'age'), '2'),
+            (('items', 'q'), {'name': 'q', 'age': '3'}),
+        ])
+        self.assertEqual(result, {'name': 'a', 'count': 5, 'tags': ['x', 'y'],
+                                  'items': {'p': Person('p', 2), 'q': Person('q', 3)}})
+        self.assertEqual(self.counter.count, 0)
+        self.assertEqual(old['tags'], ['x'])
+        self.assertEqual(self.schema.revalidate(old, [(('count',), sd.REMOVE),
+                                                      (('tags', 0), sd.REMOVE)]),
+                         dict(old, count=0, tags=[]))
+
+    def test_errors(self):
+        def errors(patches):
+            return error_tree(lambda v: self.schema.revalidate(v, patches), self.value)
+        self.assertEqual(errors([(('tags', 1), 'y'), (('tags', 2), 'z')]), {
+            'tags': [(sd.MaxLengthError, 'Ensure this value has at most 2 entries (it has 3).')]})
+        self.assertEqual(errors([(('name',), sd.REMOVE), (('other',), 1)]), {
+            '': [(sd.UnconvertedValues, 'Unconverted values: other')],
+            'name': [(sd.MissingEntry, "The 'name' entry is missing.")]})
+        self.assertEqual(errors([(('items', 'p', 'age'), 'x')]), {
+            'items.p.age': [(sd.Invalid, 'This value must be an integer.')]})
+        self.assertEqual(errors([(('tags', 5), 'x')]), {
+            'tags.5': [(sd.Invalid, "This value can't be patched.")]})
+
+class ChunkedFile(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(1)
+
+class JsonTests(TestCase):
+    schema = sd.Dict({
+        'kind': 'group',
+        'name': sd.String(),
+        'created': sd.DateTime(),
+        'scores': sd.Dict((sd.String(), sd.Float(null=True))),
+        'people': sd.List(sd.from_typing(Person)),
+        'pair': sd.Tuple((sd.Int(), sd.Bool())),
+        'limit': sd.Int(default=10),
+    }, ignore_rest=True)
+    doc = json.dumps({
+        'kind': 'group', 'name': 'Gr\u00fc\u00dfe \\"\u2603\U0001f600"',
+        'created': '2006-10-25 14:30:59', 'scores': {'a': 1.5e3, 'b': None, 'c': -2},
+        'extra': {'x': ['}', {'y': '\\"]'}], 'z': [1, 2.5, True, None]},
+        'people': [{'name': 'a', 'age': '1'}, {'age': 2, 'name': 'b'}],
+        'pair': ['3', False],
+    }, ensure_ascii=False)
+
+    def test_matches_convert(self):
+        expected = self.schema.convert(json.loads(self.doc))
+        self.assertEqual(self.schema.convert_json(self.doc), expected)
+        self.assertEqual(self.schema.convert_json(self.doc.encode('utf-8')), expected)
+        source = ChunkedFile(self.doc.encode('utf-8'))
+        self.assertEqual(self.schema.convert_json(source), expected)
+        self.assertEqual(self.schema.convert_json(io.StringIO(self.doc)), expected)
+        self.assertEqual(sd.List(sd.Int()).convert_json(' [ ] '), [])
+        self.assertEqual(sd.from_typing(Person).convert_json(
+            '{"name": "a", "age": 1}', named_tuple_to_dict=True), {'name': 'a', 'age': 1})
+
+    def test_errors(self):
+        doc = ('{"kind": "other", "created": "x", "scores": {"a": "b"},'
+               ' "people": [{"name": "a"}, {"name": "b", "age": 1, "x": 1}]}')
+        self.assertEqual(error_tree(self.schema.convert_json, doc),
+                         error_tree(self.schema.convert, json.loads(doc)))
+        with self.assertRaises(json.JSONDecodeError):
+            self.schema.convert_json('{"name": "a",}')
+        with self.assertRaises(json.JSONDecodeError):
+            sd.List(sd.Int()).convert_json('[1] 2')
+        with self.assertRaises(json.JSONDecodeError):
+            self.schema.convert_json(ChunkedFile(b'{"extra": [1, {"a": "]}"}'))
+        # Repeated keys are reported once.
+        schema = sd.from_typing(Person)
+        self.assertEqual(error_tree(schema.convert_json,
+                                    '{"name": "a", "age": 1, "x": 1, "x": 2}'),
+                         {'': [(sd.UnconvertedValues, 'Unconverted values: x')]})
+
+    def test_constants(self):
+        doc = '[NaN, Infinity, -Infinity, 1, true, null]'
+        schema = sd.List(sd.Float(null=True))
+        expected = [repr(value) for value in schema.convert(json.loads(doc))]
+        for source in (doc, ChunkedFile(doc.encode('ascii'))):
+            self.assertEqual([repr(value) for value in schema.convert_json(source)],
+                             expected)
+
+    def test_skipped_values_are_checked(self):
+        self.assertEqual(self.schema.convert_json(self.doc.replace('2.5', 'NaN')),
+                         self.schema.convert_json(self.doc))
+        for extra in ('[1 2]', '{"a" 1}', '{1: 2}', '"\\q"', 'nul', '[1,]', '{"a": tru}'):
+            with self.assertRaises(json.JSONDecodeError):
+                json.loads(extra)
+            with self.assertRaises(json.JSONDecodeError):
+                self.schema.convert_json(ChunkedFile(
+                    b'{"extra": ' + extra.encode('ascii') + b', "name": "a"}'))
+
+    def test_fail_fast(self):
+        doc = json.dumps(['x'] + list(range(100))).encode('ascii')
+        schema = sd.List(sd.Int())
+        source = ChunkedFile(doc)
+        self.assertEqual(error_tree(lambda v: schema.convert_json(v, fail_fast=True),
+                                    source), {'0': [(sd.Invalid, 'This value must be an integer.')]})
+        self.assertLess(source.reads, 10)
+        schema = sd.Dict({'a': sd.List(sd.Int(), default=[], use_default_for_invalid=True),
+                          'b': sd.Int()})
+        self.assertEqual(schema.convert_json(b'{"a": ["x", [1], 2], "b": 3}', fail_fast=True),
+                         {'a': [], 'b': 3})
+
+class InternTests(TestCase):
+    def make_schema(self):
+        return sd.Dict({
+            'a': sd.String(blank=True),
+            'b': sd.String(blank=True),
+            'c': sd.String(),
+            'emails': sd.List(sd.Email()),
+            'other': sd.List(sd.Email(validators=[sd.MaxLength(10)])),
+            'more': sd.Tuple((sd.Email(validators=[sd.MaxLength(10)]), sd.Int(default=1))),
+        })
+
+    def test_merges_identical_parts(self):
+        schema = sd.intern_schema(self.make_schema())
+        fields = schema.schema
+        self.assertIs(fields['a'], fields['b'])
+        self.assertIsNot(fields['a'], fields['c'])
+        self.assertIsNot(fields['emails'].schema, fields['other'].schema)
+        self.assertIs(fields['other'].schema, fields['more'].schema[0])
+        self.assertEqual(schema.convert({'a': '', 'b': 'x', 'c': 'y', 'emails': ['A@b.de'],
+                                         'other': [], 'more': ['a@b.de', '2']}),
+                         {'a': '', 'b': 'x', 'c': 'y', 'emails': ['a@b.de'], 'other': [],
+                          'more': ('a@b.de', 2)})
+
+        table = {}
+        first = sd.intern_schema(self.make_schema(), table)
+        second = sd.intern_schema(self.make_schema(), table)
+        self.assertIs(first, second)
+        self.assertIs(sd.intern_schema(sd.Int(default=1), table), first.schema['more'].schema[1])
+        self.assertIsNot(sd.intern_schema(sd.Int(default=lambda: 1), table),
+                         sd.intern_schema(sd.Int(default=lambda: 1), table))
+
+    def test_recursive_schema(self):
+        # The returned copy merges with the shared schema it contains.
+        schema = sd.intern_schema(sd.from_typing(Node))
+        self.assertIs(schema.schema['children'].schema, schema)
+        self.assertEqual(schema.convert({'value': 1, 'children': []}), Node(1, []))
+
+    def test_slots(self):
+        for obj in (sd.String(), sd.Dict({}), sd.OneOf(), sd.DateTime(), sd.from_typing(Person),
+                    sd.EmailValidator(), sd.MaxLength(1)):
+            self.assertFalse(hasattr(obj, '__dict__'), obj)
+        validator = pickle.loads(pickle.dumps(sd.EmailValidator(cache_size=10)))
+        self.assertEqual(validator.cache_size, 10)
+        self.assertTrue(validator.is_valid('a@b.de'))
+
+class ArrayTests(TestCase):
+    schema = sd.List(sd.Int(validators=[sd.MinValue(0), sd.MaxValue(100)]), as_array=True)
+
+    def test_array(self):
+        self.assertEqual(self.schema.convert([1, '2', True]), array.array('q', [1, 2, 1]))
+        self.assertEqual(self.schema.convert(struct.pack('=2q', 5, 6)), array.array('q', [5, 6]))
+        value = array.array('q', [1, 2])
+        self.assertIs(self.schema.convert(value, copy=False), value)
+        self.assertIsNot(self.schema.convert(value), value)
+        self.assertEqual(self.schema.dump(value), [1, 2])
+        self.assertEqual(self.schema.revalidate(value, [((2,), 3)]), array.array('q', [1, 2, 3]))
+        with self.assertRaises(TypeError):
+            sd.Set(sd.Int(), as_array=True)
+        with self.assertRaises(TypeError):
+            sd.List(sd.String(), as_array=True)
+
+    def test_errors(self):
+        self.assertEqual(error_tree(self.schema.convert, [1, 200, -1, 'x']), {
+            '1': [(sd.MaxValueError, 'This value must be smaller than 100.')],
+            '2': [(sd.MinValueError, 'This value must be larger than 0.')],
+            '3': [(sd.Invalid, 'This value must be an integer.')]})
+        self.assertEqual(error_tree(sd.List(sd.Int(), as_array=True).convert, [1, 10 ** 20]), {
+            '1': [(sd.Invalid, 'This value is out of range.')]})
+        self.assertEqual(error_tree(self.schema.convert, b'abc'), {
+            '': [(sd.Invalid, 'This value must be a multiple of 8 bytes.')]})
+        schema = sd.List(sd.Float(validators=[sd.MinValue(0)]), as_array=True)
+        self.assertEqual(error_tree(schema.convert, [float('nan'), -1.0]), {
+            '1': [(sd.MinValueError, 'This value must be larger than 0.')]})
+        self.assertFalse(schema.is_valid([1, -1]))
+        self.assertEqual(schema.compile()([1, 2.5]), array.array('d', [1, 2.5]))
+        # The sum of both infinities is NaN, too.
+        schema = sd.List(sd.Float(validators=[sd.MaxValue(0)]), as_array=True)
+        self.assertEqual(error_tree(schema.convert, [float('-inf'), float('inf')]), {
+            '1': [(sd.MaxValueError, 'This value must be smaller than 0.')]})
+
+    @skipIf(sd.numpy is None, 'NumPy is not installed')
+    def test_numpy(self):
+        numpy = sd.numpy
+        schema = sd.List(sd.Float(validators=[sd.MinValue(0)]), as_array='numpy')
+        result = schema.convert([1, 2.5])
+        self.assertEqual(result.dtype, numpy.float64)
+        self.assertEqual(result.tolist(), [1, 2.5])
+        value = numpy.arange(3.0)
+        self.assertIs(schema.convert(value, copy=False), value)
+        copied = schema.convert(value)
+        self.assertIsNot(copied, value)
+        self.assertFalse(numpy.shares_memory(copied, value))
+        self.assertEqual(schema.convert(numpy.arange(3.0)[::-1]).tolist(), [2, 1, 0])
+        self.assertEqual(error_tree(schema.convert, numpy.array([1.0, -1.0])), {
+            '1': [(sd.MinValueError, 'This value must be larger than 0.')]})
+
+class LazyTests(TestCase):
+    def setUp(self):
+        self.counter = Counter()
+        self.schema = sd.Dict({
+            'kind': 'message',
+            'id': sd.Int(),
+            'header': sd.Dict({'to': sd.String(), 'size': sd.Int(default=0)}),
+            'body': sd.List(sd.Dict({'text': sd.String(validators=[self.counter])})),
+            'extra': sd.String(optional=True),
+        })
+        self.value = {'kind': 'message', 'id': '1', 'header': {'to': 'a'},
+                      'body': [{'text': 'x'}, {'text': 'y'}]}
+
+    def test_converts_on_access(self):
+        result = self.schema.convert(self.value, lazy=True)
+        self.assertIsInstance(result, sd.LazyDict)
+        self.assertEqual(list(result), ['kind', 'id', 'header', 'body'])
+        self.assertEqual(result.pending, {'id', 'header', 'body'})
+        self.assertEqual(result['header']['to'], 'a')
+        self.assertEqual(result['header']['size'], 0)
+        self.assertEqual(result.pending, {'id', 'body'})
+        self.assertEqual(self.counter.count, 0)
+        self.assertNotIn('extra', result)
+        with self.assertRaises(KeyError):
+            result['extra']
+        expected = self.schema.convert(self.value)
+        self.assertEqual(result.materialize(), expected)
+        self.assertIs(type(result.materialize()['header']), dict)
+        self.assertEqual(dict(result), expected)
+
+    def test_errors(self):
+        self.assertEqual(error_tree(lambda v: self.schema.convert(v, lazy=True),
+                                    {'kind': 'message', 'header': {}, 'body': [],
+                                     'other': 1}), {
+            '': [(sd.UnconvertedValues, 'Unconverted values: other')],
+            'id': [(sd.MissingEntry, "The 'id' entry is missing.")]})
+        value = dict(self.value, id='x', body=[{'text': 'x'}, {'text': 1, 'x': 1}])
+        result = self.schema.convert(value, lazy=True)
+        self.assertEqual(result['kind'], 'message')
+        with self.assertRaises(sd.Invalid):
+            result['id']
+        self.assertEqual(error_tree(lambda v: v.materialize(), result),
+                         error_tree(self.schema.convert, value))
+
+    def test_materialize_skips_converted_entries(self):
+        schema = sd.Dict({
+            'id': sd.Int(validators=[self.counter]),
+            'tags': sd.List(sd.String(validators=[self.counter])),
+            'header': sd.Dict({'to': sd.String(validators=[self.counter]),
+                               'size': sd.Int(validators=[self.counter])}),
+        })
+        value = {'id': '1', 'tags': ['a'], 'header': {'to': 'b', 'size': '2'}}
+        result = schema.convert(value, lazy=True)
+        self.assertEqual([result['id'], result['tags'], result['header']['to']],
+                         [1, ['a'], 'b'])
+        self.assertEqual(self.counter.count, 3)
+        expected = schema.convert(value)
+        self.counter.count = 0
+        self.assertEqual(result.materialize(), expected)
+        # Only the size of the header was left.
+        self.assertEqual(self.counter.count, 1)
+        self.assertEqual(result.materialize(), expected)
+        self.assertEqual(self.counter.count, 1)
+
+class PlanTests(TestCase):
+    def make_schema(self, **kwargs):
+        return sd.Dict({'kind': 'x', 'a': sd.Int(), 'b': sd.Int(optional=True),
+                        'c': sd.Int(default=3)}, **kwargs)
+
+    def test_same_results(self):
+        schema = self.make_schema()
+        values = [{'kind': 'x', 'a': '1'}, {'a': 1, 'kind': 'x', 'b': 2, 'c': '4'},
+                  {'kind': 'y', 'a': 'z'}, {'kind': 'x'}, {'kind': 'x', 'a': 1, 'd': 1}]
+        for _ in range(2):
+            self.assertEqual(schema.convert(values[0]), {'kind': 'x', 'a': 1, 'c': 3})
+            self.assertEqual(schema.convert(values[1]), {'kind': 'x', 'a': 1, 'b': 2, 'c': 4})
+            for value in values[2:]:
+                self.assertEqual(error_tree(schema.convert, value),
+                                 error_tree(self.make_schema().convert, value))
+        self.assertEqual(self.make_schema(ignore_rest=True).convert(values[4]),
+                         {'kind': 'x', 'a': 1, 'c': 3})
+
+    def test_pickle(self):
+        for fields in ({}, {'a': sd.Int()}, {'a': sd.Int(), 'b': sd.Int()}):
+            schema = sd.Dict(fields)
+            value = {key: '1' for key in fields}
+            expected = schema.convert(value)
+            self.assertEqual(pickle.loads(pickle.dumps(schema)).convert(value), expected)
+
+    def test_bounded_cache(self):
+        schema = self.make_schema(ignore_rest=True)
+        for index in range(sd._PLAN_CACHE_SIZE * 3):
+            schema.convert({'kind': 'x', 'a': 1, index: 1})
+        self.assertEqual(len(schema._plans[2]), sd._PLAN_CACHE_SIZE)
+
+    def test_schema_changes(self):
+        schema = self.make_schema()
+        value = {'kind': 'x', 'a': 1}
+        schema.convert(value)
+        schema.schema['d'] = sd.Int(default=5)
+        self.assertEqual(schema.convert(value), {'kind': 'x', 'a': 1, 'c': 3, 'd': 5})
+        schema.schema['a'] = sd.Float()
+        self.assertEqual(repr(schema.convert(value)['a']), '1.0')
+        schema.schema['d'].default = sd._UNDEFINED
+        self.assertEqual(error_tree(schema.convert, value),
+                         {'d': [(sd.MissingEntry, "The 'd' entry is missing.")]})
+        schema.schema = {'a': sd.String()}
+        with self.assertRaises(sd.UnconvertedValues):
+            schema.convert(value)
+
+    def test_ignore_rest_changes(self):
+        schema = sd.Dict({'a': sd.Int()}, ignore_rest=True)
+        value = {'a': 1, 'b': 2}
+        self.assertEqual(schema.convert(value), {'a': 1})
+        copied = copy.copy(schema)
+        copied.ignore_rest = False
+        with self.assertRaises(sd.UnconvertedValues):
+            copied.convert(value)
+        self.assertEqual(schema.convert(value), {'a': 1})
+        schema.ignore_rest = False
+        with self.assertRaises(sd.UnconvertedValues):
+            schema.convert(value)
+
+class MemoTests(TestCase):
+    def test_shared_values(self):
+        counter = Counter()
+        address = sd.Dict({'city': sd.String(validators=[counter])})
+        schema = sd.Dict({'home': address, 'work': address,
+                          'other': sd.List(address)})
+        shared = {'city': 'Berlin'}
+        value = {'home': shared, 'work': shared, 'other': [shared, {'city': 'Berlin'}]}
+        memo = sd.Memo()
+        result = schema.convert(value, memo=memo)
+        self.assertEqual(result, schema.convert(value))
+        self.assertIs(result['home'], result['work'])
+        self.assertIs(result['home'], result['other'][0])
+        self.assertIsNot(result['home'], result['other'][1])
+        self.assertEqual((memo.id_hits, memo.id_misses), (2, 4))
+        # 4 without the memo, 2 with it.
+        self.assertEqual(counter.count, 6)
+        self.assertFalse(memo._ids)
+
+    def test_content_cache(self):
+        counter = Counter()
+        schema = sd.Tuple(sd.Int(validators=[counter]))
+        memo = sd.Memo(cache_size=2)
+        for value in [(1, 2), (1, 2), (3,), [1, 2], (4,), (1, 2)]:
+            self.assertEqual(schema.convert(value, memo=memo), tuple(value))
+        self.assertEqual((memo.content_hits, memo.content_misses), (1, 4))
+        self.assertEqual(len(memo._cache), 2)
+        self.assertEqual(counter.count, 8)
+        # Other options don't share the results.
+        self.assertEqual(schema.convert((3,), memo=memo, copy=False), (3,))
+        self.assertEqual(memo.content_misses, 5)
+
+    def test_mutable_results_not_cached(self):
+        schema = sd.List(sd.Int())
+        memo = sd.Memo(cache_size=10)
+        schema.convert((1, 2), memo=memo).append(99)
+        self.assertEqual(schema.convert((1, 2), memo=memo), [1, 2])
+        self.assertFalse(memo._cache)
+
+    def test_errors_not_cached(self):
+        schema = sd.List(sd.Int())
+        memo = sd.Memo(cache_size=10)
+        for _ in range(2):
+            with self.assertRaises(sd.Invalid):
+                schema.convert(('x',), memo=memo)
+        self.assertEqual((memo.content_hits, memo.content_misses), (0, 2))
+
+class ErrorLimitTests(TestCase):
+    def make_schema(self, counter):
+        return sd.Dict({'items': sd.List(sd.Int(validators=[counter])),
+                        'name': sd.String()})
+
+    def test_max_errors(self):
+        counter = Counter()
+        schema = self.make_schema(counter)
+        value = {'items': [1, 'a', 'b', 2, 'c', 'd'] * 100, 'name': None}
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert(value, max_errors=3)
+        self.assertEqual(list(cm.exception.children),
+                         [('items', 1), ('items', 2), ('items', 4)])
+        self.assertEqual(counter.count, 2)
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert(value, max_errors=1000)
+        self.assertEqual(len(cm.exception.children), 401)
+        with self.assertRaises(ValueError):
+            schema.convert(value, max_errors=0)
+
+    def test_defaults_not_counted(self):
+        schema = sd.Dict({'lists': sd.List(sd.List(sd.Int(), use_default_for_invalid=True,
+                                                   default=[])),
+                          'a': sd.Int(), 'b': sd.Int()})
+        value = {'lists': [['a', 'b']] * 5, 'a': 'x', 'b': 'y'}
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert(value, max_errors=2)
+        self.assertEqual(list(cm.exception.children), [('a',), ('b',)])
+
+    def test_bad_values(self):
+        schema = sd.List(sd.Int())
+        value = ['x' * 1000] + list(range(1000))
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert(value)
+        self.assertIs(cm.exception.bad_value, value)
+        self.assertIsNotNone(cm.exception.children[(0,)][0].__traceback__)
+
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert(value, bad_values='repr')
+        error = cm.exception
+        self.assertTrue(error.bad_value.startswith("['xxx"))
+        self.assertTrue(error.bad_value.endswith(', 0, 1, 2, 3, 4, ...]'))
+        self.assertIn('Original value: [', str(error))
+        leaf = error.children[(0,)][0]
+        self.assertIsNone(leaf.__traceback__)
+
+        with self.assertRaises(sd.Invalid) as cm:
+            schema.convert_json(json.dumps(value), bad_values='drop')
+        self.assertIs(cm.exception.bad_value, sd._UNDEFINED)
+        self.assertNotIn('Original value', str(cm.exception))
+        with self.assertRaises(ValueError):
+            schema.convert(value, bad_values='truncate')